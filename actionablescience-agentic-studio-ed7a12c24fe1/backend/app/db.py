@@ -1,7 +1,10 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Dict
+
+import orjson
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,19 +16,49 @@ DB_NAME = os.getenv("DB_NAME")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 
-SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+
+def _json_serializer(obj) -> str:
+    # orjson emits bytes; SQLAlchemy expects a str from json_serializer
+    return orjson.dumps(obj).decode()
 
-# This is the 'engine' that main.py is missing
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Async engine (asyncpg driver) so DB round-trips suspend the coroutine
+# instead of blocking the event loop. Pool sized for a single worker;
+# pre_ping + recycle guard against connections dropped by idle timeouts.
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    # Read-heavy API re-issues the same statement shapes constantly; a
+    # larger compiled-statement cache keeps them all warm (default 500)
+    query_cache_size=1200,
+    # Workflow definitions and execution payloads are JSON-heavy; orjson
+    # decodes/encodes them at C speed instead of stdlib json
+    json_deserializer=orjson.loads,
+    json_serializer=_json_serializer,
+)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps loaded attributes readable after commit;
+# an implicit refresh would require another (sync) round-trip
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 # Dependency to get a DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+def model_to_dict(obj) -> Dict[str, Any]:
+    """
+    Serialize an ORM row straight to a plain dict of its columns.
+
+    JSON columns come back already deserialized and orjson handles
+    datetimes natively, so hot list endpoints can hand this to an
+    ORJSONResponse and skip the Pydantic from_attributes pass entirely.
+    """
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
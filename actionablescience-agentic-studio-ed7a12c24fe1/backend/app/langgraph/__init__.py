@@ -3,13 +3,26 @@ LangGraph Agent Orchestration
 
 This module provides LangGraph-based agent execution with state management,
 tool calling, and conversation flow control.
+
+Re-exports are resolved lazily (PEP 562) so that importing this package -
+which happens transitively during FastAPI startup - does not pull in
+langchain/langgraph until an agent actually runs.
 """
 
-from .agent_graph import create_agent_graph, AgentState
-from .executor import LangGraphExecutor
+from typing import Any
 
 __all__ = [
     "create_agent_graph",
     "AgentState",
     "LangGraphExecutor",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("create_agent_graph", "AgentState"):
+        from . import agent_graph
+        return getattr(agent_graph, name)
+    if name == "LangGraphExecutor":
+        from .executor import LangGraphExecutor
+        return LangGraphExecutor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
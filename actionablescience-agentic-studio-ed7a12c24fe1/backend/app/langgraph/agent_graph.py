@@ -3,10 +3,20 @@ LangGraph Agent State Graph
 
 Defines the agent execution flow using LangGraph's StateGraph.
 This provides structured state management and tool orchestration.
+
+Prompt-cache invariant: the SystemMessage built for an agent is
+byte-identical across calls (no per-call data is ever interpolated into
+it), and all dynamic content - rendered user input, conversation history -
+lives in the trailing messages. Keeping the prefix stable lets the
+provider's prompt cache hit on the system prompt for every repeat call.
 """
 
-from typing import TypedDict, Annotated, Sequence, Any, Dict, List, Optional
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+import asyncio
+import functools
+from typing import TypedDict, Annotated, Sequence, Any, Dict, List, Optional, Tuple
+
+import httpx
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
@@ -14,6 +24,26 @@ from langgraph.prebuilt import ToolNode
 import operator
 
 
+# Shared HTTP transports for all ChatOpenAI instances. Without these every
+# graph builds its own connection pool and repeat calls pay TLS handshakes;
+# one keep-alive pool (HTTP/2, multiplexed) amortizes connection setup
+# across all agents for the life of the process.
+_HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=128)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _shared_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Return the process-wide sync/async HTTP clients, creating them lazily."""
+    global _http_client, _http_async_client
+    if _http_client is None:
+        _http_client = httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        _http_async_client = httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    return _http_client, _http_async_client
+
+
 class AgentState(TypedDict):
     """
     State for the agent execution graph.
@@ -34,23 +64,29 @@ class AgentState(TypedDict):
     error: Optional[str]
 
 
-def create_agent_graph(agent_model, available_tools: List[Any]):
+def create_agent_graph(agent_model, available_tools: List[Any], api_key: Optional[str] = None):
     """
     Create a LangGraph StateGraph for agent execution.
 
     Args:
         agent_model: SQLAlchemy Agent model instance with configuration
         available_tools: List of LangChain-compatible tool instances
+        api_key: OpenAI API key; falls back to the environment when None
 
     Returns:
         Compiled StateGraph ready for execution
     """
 
-    # Initialize LLM with agent configuration
+    # Initialize LLM with agent configuration, sharing the process-wide
+    # keep-alive HTTP pool instead of opening one per graph
+    http_client, http_async_client = _shared_http_clients()
     llm = ChatOpenAI(
         model="gpt-4o",
         temperature=agent_model.temperature,
         max_tokens=agent_model.max_tokens,
+        api_key=api_key,
+        http_client=http_client,
+        http_async_client=http_async_client,
     )
 
     # Bind tools to LLM if available
@@ -74,27 +110,53 @@ def create_agent_graph(agent_model, available_tools: List[Any]):
                 "error": f"Agent execution error: {str(e)}"
             }
 
+    # Map tool name -> tool instance, built once at graph construction
+    tool_map = {tool.name: tool for tool in available_tools}
+
     # Define tool execution node
-    def tool_node(state: AgentState) -> AgentState:
+    async def tool_node(state: AgentState) -> AgentState:
         """
-        Tool execution node - processes tool calls from LLM.
+        Tool execution node - runs every tool call from the last message
+        concurrently so independent tools overlap their I/O.
         """
         try:
             last_message = state["messages"][-1]
+            tool_calls = getattr(last_message, "tool_calls", None) or []
+            if not tool_calls:
+                return {}
+
+            async def run_tool(tool_call: Dict[str, Any]) -> Any:
+                tool = tool_map.get(tool_call.get("name"))
+                if tool is None:
+                    return f"Error: unknown tool '{tool_call.get('name')}'"
+                return await tool.ainvoke(tool_call.get("args", {}))
+
+            outputs = await asyncio.gather(
+                *(run_tool(tool_call) for tool_call in tool_calls),
+                return_exceptions=True
+            )
 
-            # Extract tool results for storage
             tool_results = {}
-            if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-                for tool_call in last_message.tool_calls:
-                    tool_name = tool_call.get("name")
-                    if tool_name:
-                        # Store tool call info
-                        tool_results[tool_name] = {
-                            "args": tool_call.get("args", {}),
-                            "id": tool_call.get("id"),
-                        }
+            tool_messages = []
+            for tool_call, output in zip(tool_calls, outputs):
+                if isinstance(output, BaseException):
+                    output = f"Error: {str(output)}"
+
+                tool_name = tool_call.get("name")
+                if tool_name:
+                    # Store tool call info and result
+                    tool_results[tool_name] = {
+                        "args": tool_call.get("args", {}),
+                        "id": tool_call.get("id"),
+                        "result": output,
+                    }
+
+                tool_messages.append(
+                    ToolMessage(content=str(output), tool_call_id=tool_call.get("id"))
+                )
 
             return {
+                "messages": tool_messages,
                 "tool_results": {**state.get("tool_results", {}), **tool_results}
             }
         except Exception as e:
@@ -177,6 +239,18 @@ def create_agent_graph(agent_model, available_tools: List[Any]):
     return workflow.compile()
 
 
+@functools.lru_cache(maxsize=256)
+def _stable_system_message(agent_id: int, system_prompt: str) -> SystemMessage:
+    """
+    Return a cached SystemMessage for an agent.
+
+    Keyed on the prompt content itself, so an updated agent prompt
+    naturally produces a fresh message. Dynamic per-call data must never
+    be interpolated here - see the module docstring.
+    """
+    return SystemMessage(content=system_prompt)
+
+
 def build_initial_state(
     agent_model,
     user_input: Dict[str, Any],
@@ -195,10 +269,10 @@ def build_initial_state(
     """
     messages = []
 
-    # Add system prompt
+    # Add system prompt - reuse the cached, byte-identical message so the
+    # provider-side prompt cache can hit on the stable prefix
     if agent_model.system_prompt:
-        from langchain_core.messages import SystemMessage
-        messages.append(SystemMessage(content=agent_model.system_prompt))
+        messages.append(_stable_system_message(agent_model.id, agent_model.system_prompt))
 
     # Add conversation history if memory is enabled
     if agent_model.memory_enabled and conversation_history:
@@ -212,17 +286,13 @@ def build_initial_state(
                 messages.append(AIMessage(content=content))
 
     # Add current user message
-    # Render user prompt template with input data
+    # Render the user prompt template by substituting only the known input
+    # keys. Per-key .replace keeps literal braces (JSON examples, code
+    # snippets) intact, where str.format-style rendering rejects them as
+    # malformed format specs; unknown placeholders are left as-is
     user_prompt = agent_model.user_prompt_template
-    try:
-        # Simple template rendering - replace {key} with values
-        for key, value in user_input.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in user_prompt:
-                user_prompt = user_prompt.replace(placeholder, str(value))
-    except Exception:
-        # If template rendering fails, use raw input
-        user_prompt = str(user_input)
+    for key, value in user_input.items():
+        user_prompt = user_prompt.replace("{" + key + "}", str(value))
 
     messages.append(HumanMessage(content=user_prompt))
 
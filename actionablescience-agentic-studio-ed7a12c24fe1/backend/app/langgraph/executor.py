@@ -3,22 +3,93 @@ LangGraph Executor
 
 High-level executor for running agents with LangGraph.
 Handles tool conversion, state initialization, and result extraction.
+
+LangChain/LangGraph are imported lazily on first execution: pulling them
+at module import time adds several hundred ms and tens of MB RSS to
+FastAPI startup even for requests that never run an agent.
 """
 
-from typing import Dict, Any, List, Optional
-from .agent_graph import create_agent_graph, build_initial_state
-from ..mcp import ToolRegistry
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from ..mcp.registry import registry
 from ..mcp.base_tool import BaseTool
 
-try:
-    from langchain_core.messages import HumanMessage, AIMessage
-    from langchain_core.tools import StructuredTool
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-    HumanMessage = None  # type: ignore
-    AIMessage = None  # type: ignore
-    StructuredTool = None  # type: ignore
+# Module cache slot for the lazily imported LangChain symbols
+_LC: Optional[SimpleNamespace] = None
+
+# Message class -> API role string, filled in by _langchain() so result
+# building does a single type lookup per message instead of
+# hasattr/isinstance chains
+_ROLE_MAP: Dict[type, str] = {}
+
+
+def _langchain() -> SimpleNamespace:
+    """
+    Import the LangChain/LangGraph symbols on first use and cache them.
+
+    Raises:
+        RuntimeError: If LangChain is not installed
+    """
+    global _LC
+    if _LC is None:
+        try:
+            from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
+            from langchain_core.tools import StructuredTool
+        except ImportError:
+            raise RuntimeError("LangChain not installed. Run: pip install -r requirements.txt")
+
+        from .agent_graph import create_agent_graph, build_initial_state
+
+        _ROLE_MAP.update({
+            HumanMessage: "user",
+            AIMessage: "assistant",
+            SystemMessage: "system",
+            ToolMessage: "tool",
+        })
+
+        _LC = SimpleNamespace(
+            HumanMessage=HumanMessage,
+            AIMessage=AIMessage,
+            SystemMessage=SystemMessage,
+            ToolMessage=ToolMessage,
+            StructuredTool=StructuredTool,
+            create_agent_graph=create_agent_graph,
+            build_initial_state=build_initial_state,
+        )
+    return _LC
+
+
+# Cache of compiled agent graphs, keyed by the agent fields and tool set the
+# graph actually depends on. Rebuilding the StateGraph (ChatOpenAI init,
+# bind_tools, compile) on every request is pure overhead before any LLM call.
+_GRAPH_CACHE: "OrderedDict[Tuple, Any]" = OrderedDict()
+_GRAPH_CACHE_MAX = 128
+
+
+def _get_cached_graph(cache_key: Tuple, agent_model, enabled_tools: List[Any], api_key: Optional[str]) -> Any:
+    """
+    Return a compiled agent graph for the given key, building it on a miss.
+
+    Uses a small LRU so long-running processes don't accumulate graphs for
+    agents that are no longer called.
+    """
+    graph = _GRAPH_CACHE.get(cache_key)
+    if graph is None:
+        graph = _langchain().create_agent_graph(agent_model, enabled_tools, api_key=api_key)
+        _GRAPH_CACHE[cache_key] = graph
+        if len(_GRAPH_CACHE) > _GRAPH_CACHE_MAX:
+            _GRAPH_CACHE.popitem(last=False)
+    else:
+        _GRAPH_CACHE.move_to_end(cache_key)
+    return graph
+
+
+# LangChain tool wrappers, keyed by (tool class, config signature). The
+# args schema and StructuredTool only depend on the class and the instance
+# config, so they are built once per process instead of per request.
+_TOOL_WRAPPER_CACHE: "OrderedDict[Tuple, Any]" = OrderedDict()
+_TOOL_WRAPPER_CACHE_MAX = 256
 
 
 class LangGraphExecutor:
@@ -29,68 +100,37 @@ class LangGraphExecutor:
     converting MCP tools to LangChain format and managing agent execution.
     """
 
-    def __init__(self):
-        self.registry = ToolRegistry()
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: int = 8):
+        self.registry = registry
+        # Explicit key injection; when None, ChatOpenAI falls back to the
+        # OPENAI_API_KEY environment variable
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
 
     def _mcp_tool_to_langchain(self, mcp_tool: BaseTool) -> Any:
         """
         Convert an MCP tool to LangChain-compatible format.
 
+        Wrappers are cached per (tool class, config) so repeat conversions
+        of the same tool skip Pydantic schema generation entirely.
+
         Args:
             mcp_tool: BaseTool instance
 
         Returns:
             LangChain-compatible tool wrapper
         """
-        from pydantic import Field, create_model
+        lc = _langchain()
 
-        if not LANGCHAIN_AVAILABLE:
-            raise RuntimeError("LangChain not installed. Run: pip install -r requirements.txt")
+        cache_key = (mcp_tool.__class__, repr(sorted(mcp_tool.config.items())))
+        cached = _TOOL_WRAPPER_CACHE.get(cache_key)
+        if cached is not None:
+            _TOOL_WRAPPER_CACHE.move_to_end(cache_key)
+            return cached
 
-        # Get tool metadata
+        # Get tool metadata and the cached per-class input schema
         metadata = mcp_tool.get_metadata()
-
-        # Build Pydantic model for parameters - use **kwargs for create_model
-        field_definitions: Dict[str, Any] = {}
-
-        for param in metadata.parameters:
-            # Determine the type for this parameter and create field definition
-            if param.type == "number":
-                if param.required:
-                    field_definitions[param.name] = (float, Field(..., description=param.description))
-                else:
-                    field_definitions[param.name] = (float, Field(default=getattr(param, "default", None), description=param.description))
-            elif param.type == "integer":
-                if param.required:
-                    field_definitions[param.name] = (int, Field(..., description=param.description))
-                else:
-                    field_definitions[param.name] = (int, Field(default=getattr(param, "default", None), description=param.description))
-            elif param.type == "boolean":
-                if param.required:
-                    field_definitions[param.name] = (bool, Field(..., description=param.description))
-                else:
-                    field_definitions[param.name] = (bool, Field(default=getattr(param, "default", None), description=param.description))
-            elif param.type == "array":
-                if param.required:
-                    field_definitions[param.name] = (List[Any], Field(..., description=param.description))
-                else:
-                    field_definitions[param.name] = (List[Any], Field(default=getattr(param, "default", None), description=param.description))
-            elif param.type == "object":
-                if param.required:
-                    field_definitions[param.name] = (Dict[str, Any], Field(..., description=param.description))
-                else:
-                    field_definitions[param.name] = (Dict[str, Any], Field(default=getattr(param, "default", None), description=param.description))
-            else:  # default to string
-                if param.required:
-                    field_definitions[param.name] = (str, Field(..., description=param.description))
-                else:
-                    field_definitions[param.name] = (str, Field(default=getattr(param, "default", None), description=param.description))
-
-        # Create dynamic Pydantic model
-        InputSchema = create_model(
-            f"{metadata.name.replace(' ', '')}Input",
-            **field_definitions
-        )
+        InputSchema = mcp_tool.__class__.get_args_schema()
 
         # Create wrapper function
         async def tool_func(**kwargs: Any) -> Any:
@@ -102,7 +142,7 @@ class LangGraphExecutor:
                 return f"Error: {result.error}"
 
         # Create LangChain tool
-        return StructuredTool(  # type: ignore
+        lc_tool = lc.StructuredTool(  # type: ignore
             name=metadata.id,
             description=metadata.description,
             args_schema=InputSchema,
@@ -110,6 +150,12 @@ class LangGraphExecutor:
             coroutine=tool_func,
         )
 
+        _TOOL_WRAPPER_CACHE[cache_key] = lc_tool
+        if len(_TOOL_WRAPPER_CACHE) > _TOOL_WRAPPER_CACHE_MAX:
+            _TOOL_WRAPPER_CACHE.popitem(last=False)
+
+        return lc_tool
+
     async def execute_agent(
         self,
         agent_model,
@@ -134,70 +180,217 @@ class LangGraphExecutor:
                 - error: Error message if execution failed
         """
         try:
-            # Get enabled tools from agent configuration
-            enabled_tools = []
-
-            if agent_model.tools_enabled and agent_model.tools:
-                for tool_name, enabled in agent_model.tools.items():
-                    if not enabled:
-                        continue
-
-                    # Map frontend tool names to backend tool IDs
-                    # Add your tool mappings here when you register new tools
-                    # Example:
-                    # tool_id_map = {
-                    #     "slackMessenger": "slack_messenger",
-                    #     "jiraTicket": "jira_ticket",
-                    # }
-                    tool_id_map: Dict[str, str] = {}
-
-                    tool_id = tool_id_map.get(tool_name, tool_name)
-
-                    # Get tool class and instantiate
-                    tool_class = self.registry.get_tool_class(tool_id)
-                    if tool_class:
-                        # Instantiate with config
-                        config = tool_config.get(tool_name, {}) if tool_config else {}
-                        mcp_tool = tool_class(config=config)
-
-                        # Convert to LangChain format
-                        lc_tool = self._mcp_tool_to_langchain(mcp_tool)
-                        enabled_tools.append(lc_tool)
+            graph = self._get_agent_graph(agent_model, tool_config)
 
             # Build initial state
-            initial_state = build_initial_state(
+            initial_state = _langchain().build_initial_state(
                 agent_model=agent_model,
                 user_input=user_input,
                 conversation_history=conversation_history
             )
 
-            # Create and run agent graph
-            graph = create_agent_graph(agent_model, enabled_tools)
             final_state = await graph.ainvoke(initial_state)
 
             # Extract results
-            return {
-                "content": final_state.get("final_output", ""),
-                "tool_results": final_state.get("tool_results", {}),
-                "messages": [
-                    {
-                        "role": "assistant" if hasattr(msg, "content") and not isinstance(msg, HumanMessage) else "user",
-                        "content": getattr(msg, "content", "")
+            return self._build_result(final_state)
+
+        except Exception as e:
+            return self._error_result(e)
+
+    async def execute_agent_stream(
+        self,
+        agent_model,
+        user_input: Dict[str, Any],
+        conversation_history: Optional[List[Dict]] = None,
+        tool_config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute an agent workflow, yielding incremental chunks.
+
+        Consumers (SSE endpoints, WebSocket handlers) can start
+        transmitting as soon as the model emits its first token instead of
+        waiting for the full run, and tool completions surface as they
+        happen rather than at the end.
+
+        Yields dicts with exactly one of:
+            - delta: the next piece of model output text
+            - tool_results_partial: {tool_name: result} for a finished tool
+            - error: terminal error message
+        """
+        try:
+            graph = self._get_agent_graph(agent_model, tool_config)
+
+            initial_state = _langchain().build_initial_state(
+                agent_model=agent_model,
+                user_input=user_input,
+                conversation_history=conversation_history
+            )
+
+            async for event in graph.astream_events(initial_state, version="v2"):
+                kind = event.get("event")
+                if kind == "on_chat_model_stream":
+                    token = getattr(event["data"].get("chunk"), "content", "")
+                    if token:
+                        yield {"delta": token}
+                elif kind == "on_tool_end":
+                    yield {
+                        "tool_results_partial": {
+                            event.get("name"): event["data"].get("output")
+                        }
                     }
-                    for msg in final_state.get("messages", [])
-                ],
-                "error": final_state.get("error"),
-                "processing_mode": "langgraph"
-            }
 
         except Exception as e:
-            return {
-                "content": "",
-                "tool_results": {},
-                "messages": [],
-                "error": f"Agent execution failed: {str(e)}",
-                "processing_mode": "langgraph"
-            }
+            yield {"error": f"Agent execution failed: {str(e)}"}
+
+    async def execute_agent_batch(
+        self,
+        agent_model,
+        user_inputs: List[Dict[str, Any]],
+        conversation_history: Optional[List[Dict]] = None,
+        tool_config: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute an agent for many inputs in a single batched graph run.
+
+        The graph is built once and all inputs are dispatched through
+        graph.abatch, so map-style callers (evals, bulk jobs) pay the
+        per-request setup cost once and overlap their LLM round-trips.
+
+        Args:
+            agent_model: SQLAlchemy Agent model instance
+            user_inputs: List of user input dicts, one per run
+            conversation_history: Optional conversation history shared by all runs
+            tool_config: Optional configuration for tools
+
+        Returns:
+            List of result dictionaries, in the same order as user_inputs
+        """
+        if not user_inputs:
+            return []
+
+        try:
+            graph = self._get_agent_graph(agent_model, tool_config)
+
+            initial_states = [
+                _langchain().build_initial_state(
+                    agent_model=agent_model,
+                    user_input=user_input,
+                    conversation_history=conversation_history
+                )
+                for user_input in user_inputs
+            ]
+
+            final_states = await graph.abatch(
+                initial_states,
+                config={"max_concurrency": self.max_concurrency}
+            )
+
+            return [self._build_result(final_state) for final_state in final_states]
+
+        except Exception as e:
+            return [self._error_result(e) for _ in user_inputs]
+
+    def _get_agent_graph(self, agent_model, tool_config: Optional[Dict[str, Any]]) -> Any:
+        """
+        Resolve the agent's enabled tools and return the compiled graph.
+
+        The Agent model has no version column, so the cache key carries the
+        fields the graph depends on; changing any of them naturally misses
+        the cache. Fingerprinted (frozen) tool configs get a fast path: the
+        cache key is built from the precomputed fingerprint, so a hit skips
+        tool instantiation and per-config signatures entirely.
+        """
+        fingerprint = getattr(tool_config, "fingerprint", None)
+        if fingerprint is not None:
+            cache_key = (
+                agent_model.id,
+                agent_model.temperature,
+                agent_model.max_tokens,
+                repr(agent_model.tools) if agent_model.tools_enabled else None,
+                fingerprint,
+                self.api_key,
+            )
+            graph = _GRAPH_CACHE.get(cache_key)
+            if graph is not None:
+                _GRAPH_CACHE.move_to_end(cache_key)
+                return graph
+            enabled_tools, _ = self._resolve_enabled_tools(agent_model, tool_config)
+            return _get_cached_graph(cache_key, agent_model, enabled_tools, self.api_key)
+
+        enabled_tools, tool_signature = self._resolve_enabled_tools(agent_model, tool_config)
+        cache_key = (
+            agent_model.id,
+            agent_model.temperature,
+            agent_model.max_tokens,
+            tuple(tool_signature),
+            self.api_key,
+        )
+        return _get_cached_graph(cache_key, agent_model, enabled_tools, self.api_key)
+
+    def _resolve_enabled_tools(
+        self,
+        agent_model,
+        tool_config: Optional[Dict[str, Any]]
+    ) -> Tuple[List[Any], List[Tuple[str, str]]]:
+        """Instantiate the agent's enabled tools as LangChain wrappers."""
+        enabled_tools: List[Any] = []
+        tool_signature: List[Tuple[str, str]] = []
+
+        if agent_model.tools_enabled and agent_model.tools:
+            for tool_name, enabled in agent_model.tools.items():
+                if not enabled:
+                    continue
+
+                # Map frontend tool names to backend tool IDs
+                # Add your tool mappings here when you register new tools
+                # Example:
+                # tool_id_map = {
+                #     "slackMessenger": "slack_messenger",
+                #     "jiraTicket": "jira_ticket",
+                # }
+                tool_id_map: Dict[str, str] = {}
+
+                tool_id = tool_id_map.get(tool_name, tool_name)
+
+                # Get tool class and instantiate
+                tool_class = self.registry.get_tool_class(tool_id)
+                if tool_class:
+                    # Instantiate with config
+                    config = tool_config.get(tool_name, {}) if tool_config else {}
+                    mcp_tool = tool_class(config=config)
+
+                    # Convert to LangChain format
+                    lc_tool = self._mcp_tool_to_langchain(mcp_tool)
+                    enabled_tools.append(lc_tool)
+                    tool_signature.append((tool_id, repr(sorted(config.items()))))
+
+        return enabled_tools, tool_signature
+
+    def _build_result(self, final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a final graph state into the public result dictionary."""
+        return {
+            "content": final_state.get("final_output", ""),
+            "tool_results": final_state.get("tool_results", {}),
+            "messages": [
+                {
+                    "role": _ROLE_MAP.get(type(msg), "assistant"),
+                    "content": getattr(msg, "content", "")
+                }
+                for msg in final_state.get("messages", [])
+            ],
+            "error": final_state.get("error"),
+            "processing_mode": "langgraph"
+        }
+
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        """Build the result dictionary for a failed execution."""
+        return {
+            "content": "",
+            "tool_results": {},
+            "messages": [],
+            "error": f"Agent execution failed: {str(error)}",
+            "processing_mode": "langgraph"
+        }
 
     def get_available_tools(self) -> List[Dict[str, Any]]:
         """
@@ -5,8 +5,11 @@ Orchestrates execution of multiple agents in a workflow using LangGraph.
 Handles sequential and parallel agent execution based on workflow definition.
 """
 
+import asyncio
+from collections import defaultdict
 from typing import Dict, Any, List, Optional, Annotated, Sequence
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 try:
     from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
@@ -28,6 +31,11 @@ def add_messages(existing: Sequence[BaseMessage], new: Sequence[BaseMessage]) ->
     return list(existing) + list(new)
 
 
+def merge_node_results(existing: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer function for node results - nodes return only their own entry"""
+    return {**existing, **new}
+
+
 class MultiAgentWorkflowState(TypedDict):
     """
     State for multi-agent workflow execution.
@@ -35,7 +43,7 @@ class MultiAgentWorkflowState(TypedDict):
     """
     messages: Annotated[Sequence[BaseMessage], add_messages]
     initial_input: Dict[str, Any]
-    node_results: Dict[str, Any]  # Stores output from each agent node
+    node_results: Annotated[Dict[str, Any], merge_node_results]  # Stores output from each agent node
     current_node_id: Optional[str]
     final_output: Optional[Any]
     error: Optional[str]
@@ -49,8 +57,10 @@ class MultiAgentWorkflowExecutor:
     execution of multiple agents, passing data between them.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
+        self._agents_by_id: Dict[Any, Any] = {}
+        self._incoming: Dict[str, List[Dict[str, Any]]] = {}
 
     async def execute_workflow(
         self,
@@ -82,6 +92,17 @@ class MultiAgentWorkflowExecutor:
         if not nodes:
             raise ValueError("Workflow has no nodes defined")
 
+        # Bulk-load every agent the workflow references in one query
+        # instead of one round-trip per node invocation
+        from ..models import Agent
+
+        agent_ids = [node["agent_id"] for node in nodes if isinstance(node["agent_id"], int)]
+        if agent_ids:
+            result = await self.db.execute(select(Agent).where(Agent.id.in_(agent_ids)))
+            self._agents_by_id = {agent.id: agent for agent in result.scalars()}
+        else:
+            self._agents_by_id = {}
+
         # Build and execute the workflow graph
         graph = self._build_workflow_graph(nodes, edges)
 
@@ -115,6 +136,11 @@ class MultiAgentWorkflowExecutor:
         """
         Build a LangGraph StateGraph from workflow definition.
 
+        Nodes are grouped into topological levels ("waves") so that agents
+        with no data dependency on each other execute concurrently via
+        asyncio.gather, instead of always chaining sequentially. Wall-clock
+        latency per level drops from the sum of agent latencies to the max.
+
         Args:
             nodes: List of workflow nodes with agent_id
             edges: List of workflow edges defining connections
@@ -122,39 +148,47 @@ class MultiAgentWorkflowExecutor:
         Returns:
             Compiled LangGraph StateGraph
         """
-        from ..models import Agent
         from .executor import LangGraphExecutor
 
+        # Build the reverse-adjacency map once; _prepare_agent_input runs
+        # per node invocation and would otherwise scan every edge each time
+        incoming: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for edge in edges:
+            incoming[edge["target"]].append(edge)
+        self._incoming = incoming
+
         # Create graph
         graph = StateGraph(MultiAgentWorkflowState)
 
         # Create executor for running individual agents
         agent_executor = LangGraphExecutor()
 
-        # Add nodes to graph
+        # Build the per-node executable functions
+        node_fns: Dict[str, Any] = {}
+
         for node in nodes:
             node_id = node["id"]
             agent_id = node["agent_id"]
 
-            # Create async function for this agent node
-            async def create_agent_node(node_id=node_id, agent_id=agent_id):
+            # Plain factory returning the async node function - no coroutine
+            # allocation or event-loop hop per node while building the graph
+            def make_agent_node(node_id=node_id, agent_id=agent_id):
                 async def agent_node(state: MultiAgentWorkflowState) -> Dict[str, Any]:
                     """Execute a single agent within the workflow"""
                     try:
-                        # Get agent from database
-                        agent = self.db.query(Agent).filter(Agent.id == agent_id).first()
+                        # Get agent from the prefetched map
+                        agent = self._agents_by_id.get(agent_id)
                         if not agent:
                             return {
                                 "error": f"Agent {agent_id} not found",
                                 "node_results": {
-                                    **state["node_results"],
                                     node_id: {"error": f"Agent {agent_id} not found"}
                                 }
                             }
 
                         # Prepare input for this agent
                         # Use output from previous node or initial input
-                        agent_input = self._prepare_agent_input(state, node_id, edges)
+                        agent_input = self._prepare_agent_input(state, node_id)
 
                         # Execute the agent
                         result = await agent_executor.execute_agent(
@@ -164,9 +198,9 @@ class MultiAgentWorkflowExecutor:
                             tool_config=None
                         )
 
-                        # Store result for this node
-                        node_results = state["node_results"].copy()
-                        node_results[node_id] = {
+                        # Store result for this node - the reducer merges it
+                        # into the state, so no copy of the full map is made
+                        node_entry = {
                             "agent_id": agent_id,
                             "agent_name": agent.agent_name,
                             "output": result.get("content"),
@@ -179,62 +213,165 @@ class MultiAgentWorkflowExecutor:
 
                         return {
                             "messages": [new_message],
-                            "node_results": node_results,
+                            "node_results": {node_id: node_entry},
                             "current_node_id": node_id,
                             "final_output": result.get("content")  # Last agent output becomes final
                         }
 
                     except Exception as e:
-                        node_results = state["node_results"].copy()
-                        node_results[node_id] = {
-                            "agent_id": agent_id,
-                            "error": str(e)
-                        }
                         return {
                             "error": str(e),
-                            "node_results": node_results
+                            "node_results": {
+                                node_id: {
+                                    "agent_id": agent_id,
+                                    "error": str(e)
+                                }
+                            }
                         }
 
                 return agent_node
 
-            # Add node to graph
-            graph.add_node(node_id, await create_agent_node())
+            node_fns[node_id] = make_agent_node()
 
-        # Add edges to graph
-        if not edges:
-            # No edges defined - create simple sequential flow
-            for i in range(len(nodes) - 1):
-                graph.add_edge(nodes[i]["id"], nodes[i + 1]["id"])
-            # Last node goes to END
-            graph.add_edge(nodes[-1]["id"], END)
-        else:
-            # Use defined edges
-            for edge in edges:
-                source = edge["source"]
-                target = edge["target"]
-                graph.add_edge(source, target)
+        # Group nodes into waves of mutually independent nodes. node_fns
+        # already holds the ids in definition order, so no extra pass over
+        # the node dicts is needed.
+        levels = self._topological_levels(list(node_fns), edges)
+
+        # Register one graph node per wave. Single-node waves keep the
+        # original node id so simple chains look unchanged in traces.
+        wave_names: List[str] = []
+        for index, level in enumerate(levels):
+            if len(level) == 1:
+                wave_name = level[0]
+                wave_fn = node_fns[level[0]]
+            else:
+                wave_name = f"wave_{index}"
+                wave_fn = self._make_wave_node(level, node_fns)
 
-            # Find nodes with no outgoing edges and connect them to END
-            source_nodes = {edge["source"] for edge in edges}
-            target_nodes = {edge["target"] for edge in edges}
-            all_node_ids = {node["id"] for node in nodes}
-            terminal_nodes = all_node_ids - source_nodes
+            graph.add_node(wave_name, wave_fn)
+            wave_names.append(wave_name)
 
-            for terminal_node in terminal_nodes:
-                graph.add_edge(terminal_node, END)
+        # Chain waves sequentially; data flow between individual agents is
+        # still resolved from the original edges in _prepare_agent_input.
+        for i in range(len(wave_names) - 1):
+            graph.add_edge(wave_names[i], wave_names[i + 1])
+        graph.add_edge(wave_names[-1], END)
 
-        # Set entry point to first node
-        if nodes:
-            graph.set_entry_point(nodes[0]["id"])
+        # Set entry point to first wave
+        graph.set_entry_point(wave_names[0])
 
         # Compile and return
         return graph.compile()
 
+    def _make_wave_node(self, node_ids: List[str], node_fns: Dict[str, Any]):
+        """
+        Build a graph node that runs several agent nodes concurrently.
+
+        Args:
+            node_ids: IDs of the independent nodes in this wave
+            node_fns: Mapping of node id -> agent node function
+
+        Returns:
+            Async function executing all nodes via asyncio.gather
+        """
+        async def wave_node(state: MultiAgentWorkflowState) -> Dict[str, Any]:
+            updates = await asyncio.gather(*(node_fns[node_id](state) for node_id in node_ids))
+            return self._merge_node_updates(updates)
+
+        return wave_node
+
+    def _merge_node_updates(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge state updates produced by concurrently executed agent nodes.
+
+        Messages are concatenated in node order, node_results dicts are
+        merged, and the last non-empty final_output wins.
+        """
+        merged: Dict[str, Any] = {}
+        messages: List[Any] = []
+        node_results: Dict[str, Any] = {}
+
+        for update in updates:
+            messages.extend(update.get("messages", []))
+            node_results.update(update.get("node_results", {}))
+
+            if update.get("error") and "error" not in merged:
+                merged["error"] = update["error"]
+
+            if update.get("final_output") is not None:
+                merged["final_output"] = update["final_output"]
+
+            if update.get("current_node_id") is not None:
+                merged["current_node_id"] = update["current_node_id"]
+
+        if messages:
+            merged["messages"] = messages
+        if node_results:
+            merged["node_results"] = node_results
+
+        return merged
+
+    def _topological_levels(
+        self,
+        node_ids: List[str],
+        edges: List[Dict[str, Any]]
+    ) -> List[List[str]]:
+        """
+        Group node ids into topological levels (Kahn's algorithm).
+
+        Nodes in the same level have no path between them and can run
+        concurrently. Without edges the original sequential order is kept.
+
+        Args:
+            node_ids: Workflow node ids in definition order
+            edges: List of workflow edges
+
+        Returns:
+            List of levels, each a list of node ids
+
+        Raises:
+            ValueError: If the workflow edges form a cycle
+        """
+        if not edges:
+            # No edges defined - keep the simple sequential flow
+            return [[node_id] for node_id in node_ids]
+
+        in_degree: Dict[str, int] = {node_id: 0 for node_id in node_ids}
+        outgoing: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+
+        for edge in edges:
+            source = edge["source"]
+            target = edge["target"]
+            if source in outgoing and target in in_degree:
+                outgoing[source].append(target)
+                in_degree[target] += 1
+
+        current = [node_id for node_id in node_ids if in_degree[node_id] == 0]
+        levels: List[List[str]] = []
+        visited = 0
+
+        while current:
+            levels.append(current)
+            visited += len(current)
+
+            next_level: List[str] = []
+            for node_id in current:
+                for target in outgoing[node_id]:
+                    in_degree[target] -= 1
+                    if in_degree[target] == 0:
+                        next_level.append(target)
+            current = next_level
+
+        if visited != len(node_ids):
+            raise ValueError("Workflow edges contain a cycle")
+
+        return levels
+
     def _prepare_agent_input(
         self,
         state: MultiAgentWorkflowState,
-        current_node_id: str,
-        edges: List[Dict[str, Any]]
+        current_node_id: str
     ) -> Dict[str, Any]:
         """
         Prepare input for an agent based on previous node outputs.
@@ -246,17 +383,20 @@ class MultiAgentWorkflowExecutor:
         Args:
             state: Current workflow state
             current_node_id: ID of the node being executed
-            edges: List of workflow edges
 
         Returns:
             Dictionary of input data for the agent
         """
-        # Find incoming edges to this node
-        incoming_edges = [e for e in edges if e["target"] == current_node_id]
+        # Bind the state entries once - TypedDict lookups in this hot path
+        # run for every node invocation
+        initial_input = state["initial_input"]
+
+        # Look up incoming edges from the prebuilt reverse-adjacency map
+        incoming_edges = self._incoming.get(current_node_id, ())
 
         if not incoming_edges:
             # This is an entry node - use initial input
-            return state["initial_input"]
+            return initial_input
 
         # Get the previous node's output
         # For simplicity, if multiple incoming edges, use the first one
@@ -268,8 +408,8 @@ class MultiAgentWorkflowExecutor:
             return {
                 "message": previous_result["output"],
                 "previous_agent": previous_result.get("agent_name"),
-                "context": state["initial_input"]  # Keep original context available
+                "context": initial_input  # Keep original context available
             }
         else:
             # Fallback to initial input
-            return state["initial_input"]
+            return initial_input
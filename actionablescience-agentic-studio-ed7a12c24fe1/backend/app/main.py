@@ -1,14 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from .db import engine, Base
 from .routes import agents, tools, workflows, multi_agent_workflows
-import time
+import asyncio
+import os
 from sqlalchemy.exc import OperationalError
 
 # Import MCP registry for tool registration
-from .mcp import ToolRegistry
+from .mcp import registry
 
-app = FastAPI(title="Rezolve Agentic Studio API", version="1.0.0")
+# orjson serializes nested dicts and datetimes several times faster than
+# stdlib json, which matters for responses carrying workflow JSON blobs
+app = FastAPI(
+    title="Rezolve Agentic Studio API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # Configure CORS
 app.add_middleware(
@@ -26,28 +34,32 @@ app.include_router(workflows.router)  # Prefix already defined in router
 app.include_router(multi_agent_workflows.router)  # Multi-agent workflow routes
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     """Initialize database tables and register MCP tools on startup"""
-    # Database initialization with retry logic
-    max_retries = 5
+    # Database initialization with retry logic. SKIP_DB_INIT=1 skips the
+    # schema round-trips (tests, or deployments managed by migrations).
+    if os.getenv("SKIP_DB_INIT") == "1":
+        max_retries = 0
+    else:
+        max_retries = 5
     retry_interval = 2
 
     for attempt in range(max_retries):
         try:
-            Base.metadata.create_all(bind=engine)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
             print("✓ Database tables created successfully")
             break
         except OperationalError:
             if attempt < max_retries - 1:
                 print(f"Database connection failed (attempt {attempt + 1}/{max_retries}). Retrying in {retry_interval}s...")
-                time.sleep(retry_interval)
+                await asyncio.sleep(retry_interval)
             else:
                 print(f"Failed to connect to database after {max_retries} attempts")
                 raise
 
     # Register MCP tools
     print("\n=== MCP Tool Registry Initialized ===")
-    registry = ToolRegistry()
 
     # Tools will be auto-discovered and registered here
     # Import your custom tools in app/mcp/tools/__init__.py and register them here
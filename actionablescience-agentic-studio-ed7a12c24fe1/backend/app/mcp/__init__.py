@@ -6,7 +6,7 @@ and executing AI agent tools/connectors.
 """
 
 from .base_tool import BaseTool, ToolParameter, ToolMetadata
-from .registry import ToolRegistry
+from .registry import ToolRegistry, registry
 from .executor import ToolExecutor
 
 __all__ = [
@@ -15,4 +15,5 @@ __all__ = [
     "ToolMetadata",
     "ToolRegistry",
     "ToolExecutor",
+    "registry",
 ]
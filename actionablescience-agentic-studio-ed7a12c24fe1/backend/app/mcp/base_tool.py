@@ -6,9 +6,10 @@ All MCP tools/connectors inherit from BaseTool and implement the execute method.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class ParameterType(str, Enum):
@@ -41,6 +42,10 @@ class ToolParameter(BaseModel):
 class ToolMetadata(BaseModel):
     """
     Metadata describing a tool's capabilities and configuration.
+
+    Stays a Pydantic model because it doubles as a FastAPI response
+    schema. get_metadata() implementations building from trusted literals
+    can use ToolMetadata.model_construct(...) to skip validation.
     """
     # Identification
     id: str = Field(..., description="Unique tool identifier (e.g., 'servicenow_incident')")
@@ -59,15 +64,30 @@ class ToolMetadata(BaseModel):
 
     # Usage
     is_enabled: bool = Field(default=True, description="Whether tool is active")
+    is_idempotent: bool = Field(
+        default=False,
+        description="Whether repeated calls with identical parameters return the same result "
+                    "(read-only lookups); enables short-lived result caching in the executor"
+    )
     use_count: int = Field(default=0, description="Number of times tool has been used")
 
+    # Cached OpenAI schema - metadata is effectively immutable once built,
+    # so the conversion only needs to happen once per instance
+    _openai_function: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
     def to_openai_function(self) -> Dict[str, Any]:
         """
         Convert tool metadata to OpenAI function calling format.
 
+        The schema is built on first call and cached on the instance;
+        parameters never change after get_metadata() constructs them.
+
         Returns:
             Dict formatted for OpenAI Assistants API tools parameter
         """
+        if self._openai_function is not None:
+            return self._openai_function
+
         properties: Dict[str, Any] = {}
         required: List[str] = []
 
@@ -97,7 +117,7 @@ class ToolMetadata(BaseModel):
             "required": required,
         }
 
-        return {
+        self._openai_function = {
             "type": "function",
             "function": {
                 "name": self.id,
@@ -105,14 +125,53 @@ class ToolMetadata(BaseModel):
                 "parameters": parameters_schema,
             },
         }
+        return self._openai_function
 
 
-class ToolExecutionResult(BaseModel):
-    """Result of a tool execution"""
+@dataclass(slots=True)
+class ToolExecutionResult:
+    """
+    Result of a tool execution.
+
+    A plain dataclass rather than a Pydantic model: results are built from
+    trusted internal values on every tool call, so validation would be
+    pure overhead on the hot path.
+    """
     success: bool
     data: Optional[Any] = None
     error: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None  # Extra info like execution time, tokens used, etc
+    # Extra info like execution time, tokens used, etc. Always a dict so
+    # callers can annotate it without a None check first
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+# Maps parameter types to the isinstance() check used during validation.
+# A dict lookup replaces the per-parameter if/elif chain. ARRAY/OBJECT
+# deliberately have no entry - they were never type-checked here.
+_TYPE_CHECK_MAP: Dict[ParameterType, Any] = {
+    ParameterType.STRING: str,
+    ParameterType.NUMBER: (int, float),
+    ParameterType.INTEGER: int,
+    ParameterType.BOOLEAN: bool,
+}
+
+# Human-readable type names for validation error messages
+_TYPE_NAME_MAP: Dict[ParameterType, str] = {
+    ParameterType.STRING: "a string",
+    ParameterType.NUMBER: "a number",
+    ParameterType.INTEGER: "an integer",
+    ParameterType.BOOLEAN: "a boolean",
+}
+
+# Maps metadata parameter types to Python annotation types for the
+# generated args schema
+_ARGS_SCHEMA_TYPE_MAP: Dict[ParameterType, Any] = {
+    ParameterType.NUMBER: float,
+    ParameterType.INTEGER: int,
+    ParameterType.BOOLEAN: bool,
+    ParameterType.ARRAY: List[Any],
+    ParameterType.OBJECT: Dict[str, Any],
+}
 
 
 class BaseTool(ABC):
@@ -121,8 +180,15 @@ class BaseTool(ABC):
 
     All connectors (ServiceNow, JIRA, etc.) inherit from this class
     and implement the execute method.
+
+    __slots__ drops the per-instance __dict__ (~150 bytes each), which
+    matters once instances are created per (tool, config) pair under
+    batch execution. Subclasses that need extra instance state should
+    declare their own __slots__ as well to keep the saving.
     """
 
+    __slots__ = ("config", "_metadata")
+
     def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
         """
         Initialize tool with configuration.
@@ -133,6 +199,22 @@ class BaseTool(ABC):
         self.config: Dict[str, Any] = config or {}
         self._metadata: Optional[ToolMetadata] = None
 
+    @classmethod
+    def _build_param_index(cls, metadata: Optional[ToolMetadata] = None) -> None:
+        """
+        Precompute the validation index for this tool class.
+
+        Called by the registry at registration time (passing the metadata
+        it already built) and lazily from validate_parameters for tools
+        used outside the registry. Stores a frozenset of required names
+        and a name -> ParameterType map on the class.
+        """
+        if metadata is None:
+            metadata = cls().get_metadata()
+
+        cls._required_params = frozenset(p.name for p in metadata.parameters if p.required)
+        cls._param_types = {p.name: p.type for p in metadata.parameters}
+
     @abstractmethod
     def get_metadata(self) -> ToolMetadata:
         """
@@ -160,36 +242,77 @@ class BaseTool(ABC):
         """
         Validate input parameters against tool metadata.
 
+        Uses the per-class index built at registration time (required-name
+        frozenset plus name -> type map), so validation does set/dict
+        lookups rather than touching metadata objects at all.
+
         Args:
             **kwargs: Parameters to validate
 
         Returns:
             True if valid, raises ValueError if invalid
         """
-        metadata = self.get_metadata()
-        required_params = [p.name for p in metadata.parameters if p.required]
+        cls = self.__class__
+        if "_param_types" not in cls.__dict__:
+            cls._build_param_index(self.get_metadata())
 
-        # Check required parameters
-        for param_name in required_params:
+        for param_name in cls._required_params:
             if param_name not in kwargs:
                 raise ValueError(f"Missing required parameter: {param_name}")
 
-        # Type validation
-        for param in metadata.parameters:
-            if param.name in kwargs:
-                value = kwargs[param.name]
-
-                if param.type == ParameterType.STRING and not isinstance(value, str):
-                    raise ValueError(f"Parameter '{param.name}' must be a string")
-                elif param.type == ParameterType.NUMBER and not isinstance(value, (int, float)):
-                    raise ValueError(f"Parameter '{param.name}' must be a number")
-                elif param.type == ParameterType.INTEGER and not isinstance(value, int):
-                    raise ValueError(f"Parameter '{param.name}' must be an integer")
-                elif param.type == ParameterType.BOOLEAN and not isinstance(value, bool):
-                    raise ValueError(f"Parameter '{param.name}' must be a boolean")
+        param_types = cls._param_types
+        for param_name, value in kwargs.items():
+            param_type = param_types.get(param_name)
+            if param_type is None:
+                continue
+
+            expected = _TYPE_CHECK_MAP.get(param_type)
+            if expected is not None and not isinstance(value, expected):
+                raise ValueError(
+                    f"Parameter '{param_name}' must be {_TYPE_NAME_MAP[param_type]}"
+                )
 
         return True
 
+    @classmethod
+    def get_args_schema(cls) -> Any:
+        """
+        Return the Pydantic input model for this tool's parameters.
+
+        The model is generated once per class on first call and cached on
+        the class itself, since metadata.parameters is fixed per tool.
+        pydantic.create_model is slow enough that doing this at runtime
+        per invocation is a measurable cost.
+
+        Returns:
+            Dynamically generated Pydantic model class
+        """
+        cached = cls.__dict__.get("_args_schema")
+        if cached is not None:
+            return cached
+
+        from pydantic import Field, create_model
+
+        metadata = cls().get_metadata()
+
+        field_definitions: Dict[str, Any] = {}
+        for param in metadata.parameters:
+            param_type = _ARGS_SCHEMA_TYPE_MAP.get(param.type, str)
+            if param.required:
+                field_definitions[param.name] = (param_type, Field(..., description=param.description))
+            else:
+                field_definitions[param.name] = (
+                    param_type,
+                    Field(default=param.default, description=param.description),
+                )
+
+        schema = create_model(
+            f"{metadata.name.replace(' ', '')}Input",
+            **field_definitions
+        )
+        cls._args_schema = schema
+        return schema
+
     def to_openai_tool(self) -> Dict[str, Any]:
         """
         Convert this tool to OpenAI Assistants API format.
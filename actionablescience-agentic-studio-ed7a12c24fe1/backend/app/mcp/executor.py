@@ -4,28 +4,51 @@ Tool Executor
 Handles execution of tools with error handling, logging, and metrics.
 """
 
+import asyncio
 import time
 import logging
-from typing import Any, Dict, Optional, Union, List, cast
+import orjson
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Dict, Optional, Tuple, Union, List, cast
 from .base_tool import ToolExecutionResult
-from .registry import ToolRegistry
+from .registry import ToolRegistry, registry as global_registry
 
 logger = logging.getLogger(__name__)
 
+# Bound on cached idempotent results so the cache cannot grow without limit
+_RESULT_CACHE_MAX = 256
+
 
 class ToolExecutor:
     """
     Executes tools with proper error handling and metrics collection.
+
+    Successful results of tools whose metadata declares is_idempotent are
+    cached for a short TTL, so bursts of identical read-only lookups
+    (status checks, reference data) hit the upstream service once.
     """
 
-    def __init__(self, registry: Optional[ToolRegistry] = None):
+    def __init__(
+        self,
+        registry: Optional[ToolRegistry] = None,
+        result_cache_ttl: float = 30.0,
+        max_concurrent: int = 32
+    ):
         """
         Initialize executor with tool registry.
 
         Args:
             registry: ToolRegistry instance (uses global if not provided)
+            result_cache_ttl: Seconds a cached idempotent result stays valid
+            max_concurrent: Upper bound on simultaneous tool executions in
+                batch_execute, so large batches cannot exhaust sockets or
+                hammer rate-limited upstream APIs
         """
-        self.registry = registry or ToolRegistry()
+        self.registry = registry if registry is not None else global_registry
+        self.result_cache_ttl = result_cache_ttl
+        self.max_concurrent = max_concurrent
+        self._result_cache: "OrderedDict[Tuple[str, str, str], Tuple[float, ToolExecutionResult]]" = OrderedDict()
 
     async def execute_tool(
         self,
@@ -44,7 +67,30 @@ class ToolExecutor:
         Returns:
             ToolExecutionResult with success/failure and data/error
         """
-        start_time = time.time()
+        # perf_counter_ns is monotonic - unaffected by NTP adjustments -
+        # and avoids the float rounding of time.time() for short durations
+        start_ns = time.perf_counter_ns()
+
+        # Serve idempotent tools from the short-lived result cache
+        metadata = self.registry.get_tool_metadata(tool_id)
+        cache_key: Optional[Tuple[str, str, str]] = None
+        if metadata is not None and metadata.is_idempotent:
+            cache_key = (
+                tool_id,
+                repr(sorted(parameters.items())),
+                repr(sorted((config or {}).items())),
+            )
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                expires_at, cached_result = cached
+                if expires_at > time.monotonic():
+                    self._result_cache.move_to_end(cache_key)
+                    logger.info(f"Tool {tool_id} served from result cache")
+                    # Hand back a copy with its own metadata dict so
+                    # caller-side annotations (e.g. tool_call_id) never
+                    # bleed between requests via the shared entry
+                    return replace(cached_result, metadata=dict(cached_result.metadata))
+                del self._result_cache[cache_key]
 
         try:
             # Get tool instance
@@ -71,23 +117,31 @@ class ToolExecutor:
             result = await tool.execute(**parameters)
 
             # Add execution metadata
-            execution_time = time.time() - start_time
-            if result.metadata is None:
-                result.metadata = {}
-            result.metadata["execution_time_ms"] = round(execution_time * 1000, 2)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+            result.metadata["execution_time_ms"] = round(execution_time_ms, 2)
             result.metadata["tool_id"] = tool_id
 
-            logger.info(f"Tool {tool_id} executed successfully in {execution_time:.2f}s")
+            logger.info(f"Tool {tool_id} executed successfully in {execution_time_ms / 1000:.2f}s")
+
+            # Only successful results are cached; failures should retry.
+            # Store a snapshot with its own metadata dict - the live result
+            # goes back to the caller, which may go on to annotate it
+            if cache_key is not None and result.success:
+                snapshot = replace(result, metadata=dict(result.metadata))
+                self._result_cache[cache_key] = (time.monotonic() + self.result_cache_ttl, snapshot)
+                if len(self._result_cache) > _RESULT_CACHE_MAX:
+                    self._result_cache.popitem(last=False)
+
             return result
 
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
             logger.exception(f"Error executing tool {tool_id}: {str(e)}")
             return ToolExecutionResult(
                 success=False,
                 error=f"Execution error: {str(e)}",
                 metadata={
-                    "execution_time_ms": round(execution_time * 1000, 2),
+                    "execution_time_ms": round(execution_time_ms, 2),
                     "tool_id": tool_id,
                     "error_type": type(e).__name__
                 }
@@ -109,8 +163,6 @@ class ToolExecutor:
         Returns:
             ToolExecutionResult
         """
-        import json
-
         try:
             # Parse OpenAI tool call format
             if tool_call.get("type") != "function":
@@ -123,10 +175,11 @@ class ToolExecutor:
             tool_id = function.get("name")
             arguments_str = function.get("arguments", "{}")
 
-            # Parse arguments JSON
+            # Parse arguments JSON; orjson is several times faster than the
+            # stdlib on the small payloads the model emits per call
             try:
-                parameters = json.loads(arguments_str)
-            except json.JSONDecodeError as e:
+                parameters = orjson.loads(arguments_str)
+            except orjson.JSONDecodeError as e:
                 return ToolExecutionResult(
                     success=False,
                     error=f"Invalid arguments JSON: {str(e)}"
@@ -141,8 +194,6 @@ class ToolExecutor:
             result = await self.execute_tool(tool_id, parameters, config)
 
             # Add OpenAI-specific metadata
-            if result.metadata is None:
-                result.metadata = {}
             result.metadata["tool_call_id"] = tool_call.get("id")
 
             return result
@@ -163,6 +214,9 @@ class ToolExecutor:
         """
         Execute multiple tools in parallel.
 
+        Concurrency is capped by max_concurrent via a semaphore; calls
+        beyond the cap queue up instead of all firing at once.
+
         Args:
             tool_calls: List of tool calls
             tool_configs: Dictionary mapping tool_id -> config
@@ -170,16 +224,17 @@ class ToolExecutor:
         Returns:
             List of ToolExecutionResults in same order as input
         """
-        import asyncio
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def bounded_execute(tool_call: Dict[str, Any]) -> ToolExecutionResult:
+            async with semaphore:
+                return await self.execute_tool(
+                    tool_call["tool_id"],
+                    tool_call["parameters"],
+                    tool_configs.get(tool_call["tool_id"]) if tool_configs else None
+                )
 
-        tasks = [
-            self.execute_tool(
-                tool_call["tool_id"],
-                tool_call["parameters"],
-                tool_configs.get(tool_call["tool_id"]) if tool_configs else None
-            )
-            for tool_call in tool_calls
-        ]
+        tasks = [bounded_execute(tool_call) for tool_call in tool_calls]
 
         results: List[Union[ToolExecutionResult, BaseException]] = await asyncio.gather(
             *tasks, return_exceptions=True
@@ -4,25 +4,60 @@ Tool Registry
 Registry for discovering, registering, and managing all available tools.
 """
 
-from typing import Dict, List, Optional, Type
+import logging
+import os
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Set, Tuple, Type
 from .base_tool import BaseTool, ToolMetadata, ToolExecutionResult
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on cached tool instances; tools are light, this just keeps
+# a long-running process from accumulating entries for stale configs
+_INSTANCE_CACHE_MAX = 128
+
+# Upper bound on memoized OpenAI-format tool lists; ids come from request
+# input, so the cache is bounded against unbounded key growth
+_OPENAI_LIST_CACHE_MAX = 64
+
 
 class ToolRegistry:
     """
-    Singleton registry for all MCP tools.
+    Registry for all MCP tools.
 
     Provides methods to register, discover, and instantiate tools.
+
+    The application shares the module-level `registry` instance below;
+    callers import it directly instead of constructing their own. Plain
+    construction (e.g. in tests) yields an independent, empty registry.
     """
 
-    _instance: Optional["ToolRegistry"] = None
-    _tools: Dict[str, Type[BaseTool]] = {}
+    def __init__(self) -> None:
+        self._tools: Dict[str, Type[BaseTool]] = {}
+
+        # Static per-class metadata and its OpenAI schema, captured once at
+        # registration so listing/lookup paths never re-instantiate tool classes
+        self._metadata_cache: Dict[str, ToolMetadata] = {}
+        self._openai_cache: Dict[str, Dict] = {}
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._tools = {}
-        return cls._instance
+        # Inverse indexes maintained at register/unregister time so
+        # filtered listings are set lookups instead of scans over all
+        # cached metadata
+        self._by_category: Dict[str, Set[str]] = defaultdict(set)
+        self._enabled: Set[str] = set()
+
+        # LRU of tool instances keyed by (tool_id, config signature).
+        # Tool instances only carry their config, so the same config can
+        # reuse the same instance instead of re-running __init__ per call.
+        self._instance_cache: "OrderedDict[Tuple[str, str], BaseTool]" = OrderedDict()
+
+        # Memoized stats() payload, dropped whenever the registry mutates
+        self._stats_cache: Optional[Dict] = None
+
+        # Memoized OpenAI-format lists keyed by the requested id tuple
+        # (None = all enabled tools), likewise dropped on mutation. LLM
+        # clients re-request the same tool sets constantly.
+        self._openai_list_cache: "OrderedDict[Optional[Tuple[str, ...]], List[Dict]]" = OrderedDict()
 
     def register(self, tool_class: Type[BaseTool]) -> None:
         """
@@ -41,7 +76,15 @@ class ToolRegistry:
             raise ValueError(f"Tool with ID '{metadata.id}' already registered")
 
         self._tools[metadata.id] = tool_class
-        print(f"✓ Registered tool: {metadata.id} ({metadata.name})")
+        self._metadata_cache[metadata.id] = metadata
+        self._openai_cache[metadata.id] = metadata.to_openai_function()
+        self._by_category[metadata.category].add(metadata.id)
+        if metadata.is_enabled:
+            self._enabled.add(metadata.id)
+        tool_class._build_param_index(metadata)
+        self._stats_cache = None
+        self._openai_list_cache.clear()
+        logger.debug("Registered tool: %s (%s)", metadata.id, metadata.name)
 
 
 
@@ -54,7 +97,16 @@ class ToolRegistry:
         """
         if tool_id in self._tools:
             del self._tools[tool_id]
-            print(f"✓ Unregistered tool: {tool_id}")
+            metadata = self._metadata_cache.pop(tool_id, None)
+            self._openai_cache.pop(tool_id, None)
+            if metadata is not None:
+                self._by_category[metadata.category].discard(tool_id)
+            self._enabled.discard(tool_id)
+            for cache_key in [key for key in self._instance_cache if key[0] == tool_id]:
+                del self._instance_cache[cache_key]
+            self._stats_cache = None
+            self._openai_list_cache.clear()
+            logger.debug("Unregistered tool: %s", tool_id)
 
 
 
@@ -77,6 +129,11 @@ class ToolRegistry:
         """
         Creates an instance of a tool with given configuration.
 
+        Instances are cached per (tool_id, config) so repeated executions
+        with the same configuration reuse one object. Config values may be
+        unhashable (nested dicts), so the signature uses repr of the
+        sorted items rather than the values themselves.
+
         Args:
             tool_id: Tool identifier
             config: Tool-specific configuration
@@ -85,9 +142,20 @@ class ToolRegistry:
             Tool instance if found, None otherwise
         """
         tool_class = self.get_tool_class(tool_id)
-        if tool_class:
-            return tool_class(config=config)
-        return None
+        if tool_class is None:
+            return None
+
+        cache_key = (tool_id, repr(sorted((config or {}).items())))
+        instance = self._instance_cache.get(cache_key)
+        if instance is not None:
+            self._instance_cache.move_to_end(cache_key)
+            return instance
+
+        instance = tool_class(config=config)
+        self._instance_cache[cache_key] = instance
+        if len(self._instance_cache) > _INSTANCE_CACHE_MAX:
+            self._instance_cache.popitem(last=False)
+        return instance
     
     
     
@@ -109,7 +177,6 @@ class ToolRegistry:
 
         # Load config if not provided
         if config is None:
-            import os
             config = {
                 "FIRECRAWL_API_KEY": os.getenv("FIRECRAWL_API_KEY")
             }
@@ -136,22 +203,16 @@ class ToolRegistry:
         Returns:
             List of ToolMetadata objects
         """
-        metadata_list = []
+        if category:
+            tool_ids = self._by_category.get(category, set())
+            if enabled_only:
+                tool_ids = tool_ids & self._enabled
+            return [self._metadata_cache[tool_id] for tool_id in tool_ids]
 
-        for tool_id, tool_class in self._tools.items():
-            temp_instance = tool_class()
-            metadata = temp_instance.get_metadata()
+        if enabled_only:
+            return [self._metadata_cache[tool_id] for tool_id in self._enabled]
 
-            # Apply filters
-            if enabled_only and not metadata.is_enabled:
-                continue
-
-            if category and metadata.category != category:
-                continue
-
-            metadata_list.append(metadata)
-
-        return metadata_list
+        return list(self._metadata_cache.values())
 
     def get_tool_metadata(self, tool_id: str) -> Optional[ToolMetadata]:
         """
@@ -163,11 +224,7 @@ class ToolRegistry:
         Returns:
             ToolMetadata if found, None otherwise
         """
-        tool_class = self.get_tool_class(tool_id)
-        if tool_class:
-            temp_instance = tool_class()
-            return temp_instance.get_metadata()
-        return None
+        return self._metadata_cache.get(tool_id)
     
 
     def get_openai_tools(self, tool_ids: Optional[List[str]] = None) -> List[Dict]:
@@ -180,28 +237,62 @@ class ToolRegistry:
         Returns:
             List of tool definitions in OpenAI format
         """
-        openai_tools = []
+        cache_key = tuple(tool_ids) if tool_ids else None
+        cached = self._openai_list_cache.get(cache_key)
+        if cached is not None:
+            self._openai_list_cache.move_to_end(cache_key)
+            return cached
 
         if tool_ids:
-            # Get specific tools
-            for tool_id in tool_ids:
-                tool_class = self.get_tool_class(tool_id)
-                if tool_class:
-                    temp_instance = tool_class()
-                    openai_tools.append(temp_instance.to_openai_tool())
+            # Specific tools, skipping unknown ids
+            get_schema = self._openai_cache.get
+            tools = [schema for schema in map(get_schema, tool_ids) if schema is not None]
         else:
-            # Get all enabled tools
-            for tool_id, tool_class in self._tools.items():
-                temp_instance = tool_class()
-                metadata = temp_instance.get_metadata()
-                if metadata.is_enabled:
-                    openai_tools.append(temp_instance.to_openai_tool())
+            # All enabled tools
+            tools = [
+                schema
+                for tool_id, schema in self._openai_cache.items()
+                if self._metadata_cache[tool_id].is_enabled
+            ]
+
+        self._openai_list_cache[cache_key] = tools
+        if len(self._openai_list_cache) > _OPENAI_LIST_CACHE_MAX:
+            self._openai_list_cache.popitem(last=False)
+        return tools
+
+    def stats(self) -> Dict:
+        """
+        Get registry statistics: totals and a per-category histogram.
 
-        return openai_tools
+        Reads straight off the inverse indexes, so no pass over the tools
+        is needed; the result is memoized until the registry mutates.
+
+        Returns:
+            Dict with total_tools, enabled_tools, disabled_tools, categories
+        """
+        if self._stats_cache is None:
+            self._stats_cache = {
+                "total_tools": len(self._tools),
+                "enabled_tools": len(self._enabled),
+                "disabled_tools": len(self._tools) - len(self._enabled),
+                "categories": {
+                    category: len(tool_ids)
+                    for category, tool_ids in self._by_category.items()
+                    if tool_ids
+                },
+            }
+        return self._stats_cache
 
     def clear(self) -> None:
         """Clear all registered tools (useful for testing)"""
         self._tools.clear()
+        self._metadata_cache.clear()
+        self._openai_cache.clear()
+        self._by_category.clear()
+        self._enabled.clear()
+        self._instance_cache.clear()
+        self._stats_cache = None
+        self._openai_list_cache.clear()
 
     def __len__(self) -> int:
         """Return number of registered tools"""
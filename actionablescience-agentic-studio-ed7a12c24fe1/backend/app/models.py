@@ -1,14 +1,18 @@
 import enum
 from datetime import datetime
 from sqlalchemy import (
-    Integer, String, Boolean, Float, Text, Enum, DateTime, ForeignKey
+    Column, Integer, String, Boolean, Float, Text, CheckConstraint, DateTime, ForeignKey, Index,
+    Table, func
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Dict, List, Any, Optional
 from .db import Base
 
-# Define the possible statuses using Python's enum
+# Define the possible statuses using Python's enum. The columns below
+# store plain strings (see the check constraints); these str-enums are the
+# API-layer vocabulary and compare equal to the stored values, so callers
+# can keep writing e.g. WorkflowStatus.RUNNING.
 class AgentStatus(str, enum.Enum):
     DRAFT = "draft"
     DEPLOYED = "deployed"
@@ -34,6 +38,14 @@ class MultiAgentWorkflowExecutionStatus(str, enum.Enum):
 class Agent(Base):
     __tablename__ = "agents"
 
+    # GIN index so JSONB containment queries like
+    # Agent.tools.contains({"servicenow": {"enabled": True}}) probe the
+    # index instead of evaluating the path on every row
+    __table_args__ = (
+        Index("ix_agent_tools_gin", "tools", postgresql_using="gin"),
+        CheckConstraint("status IN ('draft','deployed','archived')", name="ck_agent_status"),
+    )
+
     # Modern SQLAlchemy 2.0 syntax with type annotations
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     agent_name: Mapped[str] = mapped_column(String, index=True)
@@ -63,11 +75,16 @@ class Agent(Base):
     enable_monitoring: Mapped[bool] = mapped_column(Boolean, default=True)
     send_notifications: Mapped[bool] = mapped_column(Boolean, default=True)
 
-    # Status column using the Enum
-    status: Mapped[AgentStatus] = mapped_column(Enum(AgentStatus), default=AgentStatus.DRAFT, nullable=False)
+    # Status stored as a plain string - no per-row Enum coercion on load;
+    # indexed because it is the standard list filter
+    status: Mapped[str] = mapped_column(String(16), default=AgentStatus.DRAFT.value, nullable=False, index=True)
 
-    # Relationship to workflows
-    workflows: Mapped[List["Workflow"]] = relationship("Workflow", back_populates="agent")
+    # Relationship to workflows. lazy="raise_on_sql" turns accidental
+    # per-row lazy loads (classic N+1) into loud errors; query sites that
+    # need the collection must ask for it with selectinload()/joinedload()
+    workflows: Mapped[List["Workflow"]] = relationship(
+        "Workflow", back_populates="agent", lazy="raise_on_sql"
+    )
 
 
 class Workflow(Base):
@@ -77,22 +94,30 @@ class Workflow(Base):
     """
     __tablename__ = "workflows"
 
+    # Composite index for the "workflows of agent X in status Y" checks
+    # (delete guards, execution listings); the single-column indexes cover
+    # plain FK joins and status-only filters
+    __table_args__ = (
+        Index("ix_workflow_agent_status", "agent_id", "status"),
+        CheckConstraint("status IN ('pending','running','completed','failed')", name="ck_workflow_status"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    agent_id: Mapped[int] = mapped_column(ForeignKey("agents.id"), nullable=False)
+    agent_id: Mapped[int] = mapped_column(ForeignKey("agents.id"), nullable=False, index=True)
 
     # Execution details
-    status: Mapped[WorkflowStatus] = mapped_column(Enum(WorkflowStatus), default=WorkflowStatus.PENDING)
+    status: Mapped[str] = mapped_column(String(16), default=WorkflowStatus.PENDING.value, index=True)
     input_data: Mapped[Dict[str, Any]] = mapped_column(JSONB)
     output_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Timestamps set by Postgres so inserts skip the Python-side default
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Relationship back to agent
-    agent: Mapped["Agent"] = relationship("Agent", back_populates="workflows")
+    agent: Mapped["Agent"] = relationship("Agent", back_populates="workflows", lazy="raise_on_sql")
 
 
 class MultiAgentWorkflow(Base):
@@ -102,6 +127,13 @@ class MultiAgentWorkflow(Base):
     """
     __tablename__ = "multi_agent_workflows"
 
+    # GIN index covering containment queries against the definition, e.g.
+    # "which workflows reference agent 123 in their nodes"
+    __table_args__ = (
+        Index("ix_workflow_def_gin", "workflow_definition", postgresql_using="gin"),
+        CheckConstraint("status IN ('draft','active','archived')", name="ck_maw_status"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, index=True)
     description: Mapped[str] = mapped_column(Text)
@@ -114,22 +146,46 @@ class MultiAgentWorkflow(Base):
     workflow_definition: Mapped[Dict[str, Any]] = mapped_column(JSONB)
 
     # Status and metadata
-    status: Mapped[MultiAgentWorkflowStatus] = mapped_column(
-        Enum(MultiAgentWorkflowStatus),
-        default=MultiAgentWorkflowStatus.DRAFT
+    status: Mapped[str] = mapped_column(
+        String(16),
+        default=MultiAgentWorkflowStatus.DRAFT.value,
+        index=True
     )
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationship to executions
     executions: Mapped[List["MultiAgentWorkflowExecution"]] = relationship(
         "MultiAgentWorkflowExecution",
-        back_populates="workflow"
+        back_populates="workflow",
+        lazy="raise_on_sql"
     )
 
 
+# Normalized index of which agents a workflow's definition references.
+# Maintained by the create/update workflow routes; lets delete_agent run an
+# indexed lookup instead of scanning workflow_definition JSON at delete time.
+workflow_agent_refs = Table(
+    "workflow_agent_refs",
+    Base.metadata,
+    Column(
+        "workflow_id",
+        Integer,
+        ForeignKey("multi_agent_workflows.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "agent_id",
+        Integer,
+        ForeignKey("agents.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_war_agent", "agent_id"),
+)
+
+
 class MultiAgentWorkflowExecution(Base):
     """
     Execution instance of a multi-agent workflow.
@@ -137,13 +193,20 @@ class MultiAgentWorkflowExecution(Base):
     """
     __tablename__ = "multi_agent_workflow_executions"
 
+    __table_args__ = (
+        # Serves the running-execution guards, which filter by workflow + status
+        Index("ix_mawe_workflow_status", "workflow_id", "status"),
+        CheckConstraint("status IN ('pending','running','completed','failed')", name="ck_mawe_status"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    workflow_id: Mapped[int] = mapped_column(ForeignKey("multi_agent_workflows.id"), nullable=False)
+    workflow_id: Mapped[int] = mapped_column(ForeignKey("multi_agent_workflows.id"), nullable=False, index=True)
 
     # Execution status and data
-    status: Mapped[MultiAgentWorkflowExecutionStatus] = mapped_column(
-        Enum(MultiAgentWorkflowExecutionStatus),
-        default=MultiAgentWorkflowExecutionStatus.PENDING
+    status: Mapped[str] = mapped_column(
+        String(16),
+        default=MultiAgentWorkflowExecutionStatus.PENDING.value,
+        index=True
     )
 
     # Input/output for the entire workflow
@@ -157,13 +220,14 @@ class MultiAgentWorkflowExecution(Base):
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Relationship back to workflow template
     workflow: Mapped["MultiAgentWorkflow"] = relationship(
         "MultiAgentWorkflow",
-        back_populates="executions"
+        back_populates="executions",
+        lazy="raise_on_sql"
     )
 
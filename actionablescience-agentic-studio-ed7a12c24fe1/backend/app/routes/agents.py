@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from .. import models, schemas
-from ..db import get_db
+from ..db import get_db, model_to_dict
+from ..services import agent_read_cache, workflow_result_cache
+from .dependencies import get_agent_or_404
 
 router = APIRouter(
     prefix="/api/v1/agents",
@@ -10,7 +14,7 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=schemas.Agent, status_code=201)
-def create_agent(agent: schemas.AgentCreate, db: Session = Depends(get_db)):
+async def create_agent(agent: schemas.AgentCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new agent and save it to the database.
     If auto_deploy is enabled, automatically deploy the agent.
@@ -24,102 +28,156 @@ def create_agent(agent: schemas.AgentCreate, db: Session = Depends(get_db)):
     else:
         agent_data['status'] = models.AgentStatus.DRAFT
 
-    db_agent = models.Agent(**agent_data)
-    db.add(db_agent)
-    db.commit()
-    db.refresh(db_agent)
+    # INSERT ... RETURNING hands back the final row (including
+    # database-stamped defaults) without a refresh SELECT
+    db_agent = (
+        await db.execute(
+            insert(models.Agent).values(**agent_data).returning(models.Agent)
+        )
+    ).scalar_one()
+    await db.commit()
     return db_agent
 
 @router.get("/", response_model=List[schemas.Agent])
-def get_all_agents(db: Session = Depends(get_db)):
+async def get_all_agents(db: AsyncSession = Depends(get_db)):
     """
     Retrieve a list of all agents from the database.
     """
-    agents = db.query(models.Agent).all()
-    return agents
+    result = await db.execute(select(models.Agent))
+    # Returning a Response directly skips the Pydantic re-validation pass;
+    # response_model above still documents the shape
+    return ORJSONResponse([model_to_dict(agent) for agent in result.scalars()])
 
 # endpoint for getting an agent by its ID.
 @router.get("/{agent_id}", response_model=schemas.Agent)
-def get_agent_by_id(agent_id: int, db: Session = Depends(get_db)):
+async def get_agent_by_id(agent_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retrieve a single agent from the database by its unique ID.
+
+    The frontend fetches agents on every render, so warm reads are served
+    from a short-TTL cache of the serialized row; the update, deploy and
+    delete endpoints invalidate it.
     """
-    db_agent = db.query(models.Agent).filter(models.Agent.id == agent_id).first()
+    cached = agent_read_cache.get(agent_id)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    db_agent = await db.get(models.Agent, agent_id)
     if db_agent is None:
         raise HTTPException(status_code=404, detail="Agent not found")
-    return db_agent
 
+    payload = model_to_dict(db_agent)
+    agent_read_cache.put(agent_id, payload)
+    return ORJSONResponse(payload)
 
-@router.put("/{agent_id}", response_model=schemas.Agent)
-def update_agent(agent_id: int, agent_update: schemas.AgentCreate, db: Session = Depends(get_db)):
-    db_agent = db.query(models.Agent).filter(models.Agent.id == agent_id).first()
-    if db_agent is None:
-        raise HTTPException(status_code=404, detail="Agent not found")
 
+@router.put("/{agent_id}", response_model=schemas.Agent)
+async def update_agent(
+    agent_update: schemas.AgentCreate,
+    db_agent: models.Agent = Depends(get_agent_or_404),
+    db: AsyncSession = Depends(get_db),
+):
     # Update the agent's fields
     update_data = agent_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_agent, key, value)
 
-    db.commit()
-    db.refresh(db_agent)
+    await db.commit()
+    await db.refresh(db_agent)
+
+    # Cached execution results and reads may reflect the old configuration.
+    # Multi-agent workflow results are keyed by workflow id, so look up the
+    # workflows referencing this agent and drop their entries too
+    workflow_ids = (
+        await db.execute(
+            select(models.workflow_agent_refs.c.workflow_id).where(
+                models.workflow_agent_refs.c.agent_id == db_agent.id
+            )
+        )
+    ).scalars().all()
+
+    workflow_result_cache.invalidate("agent", db_agent.id)
+    for workflow_id in workflow_ids:
+        workflow_result_cache.invalidate("workflow", workflow_id)
+    agent_read_cache.invalidate(db_agent.id)
+
     return db_agent
 
 
 @router.post("/{agent_id}/deploy", response_model=schemas.Agent)
-def deploy_agent(agent_id: int, db: Session = Depends(get_db)):
+async def deploy_agent(
+    db_agent: models.Agent = Depends(get_agent_or_404),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Deploy an agent manually (change status from DRAFT to DEPLOYED).
     """
-    db_agent = db.query(models.Agent).filter(models.Agent.id == agent_id).first()
-    if db_agent is None:
-        raise HTTPException(status_code=404, detail="Agent not found")
-
     if db_agent.status == models.AgentStatus.DEPLOYED:
         raise HTTPException(status_code=400, detail="Agent is already deployed")
 
     db_agent.status = models.AgentStatus.DEPLOYED
-    db.commit()
-    db.refresh(db_agent)
+    await db.commit()
+    await db.refresh(db_agent)
+
+    agent_read_cache.invalidate(db_agent.id)
+
     return db_agent
 
 
 @router.delete("/{agent_id}")
-def delete_agent(agent_id: int, db: Session = Depends(get_db)):
+async def delete_agent(
+    db_agent: models.Agent = Depends(get_agent_or_404),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Delete an agent. Prevents deletion if:
     1. Agent has running workflows
     2. Agent is used in any active multi-agent workflows
     """
-    db_agent = db.query(models.Agent).filter(models.Agent.id == agent_id).first()
-    if db_agent is None:
-        raise HTTPException(status_code=404, detail="Agent not found")
+    agent_id = db_agent.id
 
-    # Check for running single-agent workflows
-    running_workflows = db.query(models.Workflow).filter(
+    # Check for running single-agent workflows. EXISTS lets Postgres stop
+    # at the first matching row instead of counting them all; the count is
+    # only fetched on the error path for the message
+    running_filter = (
         models.Workflow.agent_id == agent_id,
         models.Workflow.status.in_([models.WorkflowStatus.PENDING, models.WorkflowStatus.RUNNING])
-    ).count()
+    )
 
-    if running_workflows > 0:
+    has_running = (
+        await db.execute(
+            select(select(models.Workflow.id).where(*running_filter).exists())
+        )
+    ).scalar_one()
+
+    if has_running:
+        running_workflows = (
+            await db.execute(
+                select(func.count(models.Workflow.id)).where(*running_filter)
+            )
+        ).scalar_one()
         raise HTTPException(
             status_code=400,
             detail=f"Cannot delete agent. It has {running_workflows} running workflow(s). Please wait for them to complete."
         )
 
-    # Check if agent is used in any active multi-agent workflows
-    active_multi_workflows = db.query(models.MultiAgentWorkflow).filter(
-        models.MultiAgentWorkflow.status == models.MultiAgentWorkflowStatus.ACTIVE
-    ).all()
-
-    workflows_using_agent = []
-    for workflow in active_multi_workflows:
-        workflow_def = workflow.workflow_definition
-        if workflow_def and 'nodes' in workflow_def:
-            for node in workflow_def['nodes']:
-                if node.get('agent_id') == agent_id:
-                    workflows_using_agent.append(workflow.name)
-                    break
+    # Check if agent is used in any active multi-agent workflows. The
+    # workflow_agent_refs side table is kept current by the workflow
+    # create/update routes, so this is a plain indexed join instead of a
+    # JSON scan at delete time
+    workflows_using_agent = (
+        await db.execute(
+            select(models.MultiAgentWorkflow.name)
+            .join(
+                models.workflow_agent_refs,
+                models.workflow_agent_refs.c.workflow_id == models.MultiAgentWorkflow.id,
+            )
+            .where(
+                models.MultiAgentWorkflow.status == models.MultiAgentWorkflowStatus.ACTIVE,
+                models.workflow_agent_refs.c.agent_id == agent_id,
+            )
+        )
+    ).scalars().all()
 
     if workflows_using_agent:
         raise HTTPException(
@@ -127,27 +185,37 @@ def delete_agent(agent_id: int, db: Session = Depends(get_db)):
             detail=f"Cannot delete agent. It is used in active workflow(s): {', '.join(workflows_using_agent)}. Please remove it from these workflows first."
         )
 
-    # Check for running multi-agent workflow executions that use this agent
-    running_executions = db.query(models.MultiAgentWorkflowExecution).join(
-        models.MultiAgentWorkflow
-    ).filter(
-        models.MultiAgentWorkflowExecution.status.in_([
-            models.MultiAgentWorkflowExecutionStatus.PENDING,
-            models.MultiAgentWorkflowExecutionStatus.RUNNING
-        ])
-    ).all()
-
-    for execution in running_executions:
-        workflow = execution.workflow
-        if workflow.workflow_definition and 'nodes' in workflow.workflow_definition:
-            for node in workflow.workflow_definition['nodes']:
-                if node.get('agent_id') == agent_id:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Cannot delete agent. Workflow '{workflow.name}' is currently executing with this agent."
-                    )
+    # Check for running multi-agent workflow executions that use this agent.
+    # Same ref-table lookup as above, joined against the running executions
+    executing_workflow = (
+        await db.execute(
+            select(models.MultiAgentWorkflow.name)
+            .join(models.MultiAgentWorkflowExecution)
+            .join(
+                models.workflow_agent_refs,
+                models.workflow_agent_refs.c.workflow_id == models.MultiAgentWorkflow.id,
+            )
+            .where(
+                models.MultiAgentWorkflowExecution.status.in_([
+                    models.MultiAgentWorkflowExecutionStatus.PENDING,
+                    models.MultiAgentWorkflowExecutionStatus.RUNNING
+                ]),
+                models.workflow_agent_refs.c.agent_id == agent_id,
+            )
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+
+    if executing_workflow is not None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot delete agent. Workflow '{executing_workflow}' is currently executing with this agent."
+        )
 
     # Safe to delete
-    db.delete(db_agent)
-    db.commit()
+    await db.delete(db_agent)
+    await db.commit()
+
+    agent_read_cache.invalidate(agent_id)
+
     return {"message": f"Agent '{db_agent.agent_name}' deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Shared route dependencies.
+
+Centralizes the fetch-by-path-id-or-404 pattern the routers repeat, so
+loader strategies live in one place. Each dependency uses Session.get,
+which serves repeated lookups within a request from the identity map.
+"""
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..db import get_db
+
+
+async def get_agent_or_404(agent_id: int, db: AsyncSession = Depends(get_db)) -> models.Agent:
+    """Fetch the agent named by the path, raising 404 if it does not exist."""
+    agent = await db.get(models.Agent, agent_id)
+    if agent is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    return agent
+
+
+async def get_workflow_or_404(workflow_id: int, db: AsyncSession = Depends(get_db)) -> models.Workflow:
+    """Fetch the workflow execution record named by the path, or 404."""
+    workflow = await db.get(models.Workflow, workflow_id)
+    if workflow is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return workflow
+
+
+async def get_multi_agent_workflow_or_404(
+    workflow_id: int, db: AsyncSession = Depends(get_db)
+) -> models.MultiAgentWorkflow:
+    """Fetch the multi-agent workflow named by the path, or 404."""
+    workflow = await db.get(models.MultiAgentWorkflow, workflow_id)
+    if workflow is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return workflow
+
+
+async def get_execution_or_404(
+    execution_id: int, db: AsyncSession = Depends(get_db)
+) -> models.MultiAgentWorkflowExecution:
+    """Fetch the multi-agent workflow execution named by the path, or 404."""
+    execution = await db.get(models.MultiAgentWorkflowExecution, execution_id)
+    if execution is None:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    return execution
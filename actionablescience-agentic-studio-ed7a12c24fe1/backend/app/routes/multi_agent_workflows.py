@@ -4,14 +4,23 @@ Multi-Agent Workflow API Routes
 Handles CRUD operations and execution for multi-agent workflows.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import case, delete, desc, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from datetime import datetime
 
-from ..db import get_db
-from ..models import MultiAgentWorkflow, MultiAgentWorkflowExecution, MultiAgentWorkflowStatus, MultiAgentWorkflowExecutionStatus
+from ..db import SessionLocal, get_db, model_to_dict
+from ..models import (
+    MultiAgentWorkflow,
+    MultiAgentWorkflowExecution,
+    MultiAgentWorkflowExecutionStatus,
+    MultiAgentWorkflowStatus,
+    workflow_agent_refs,
+)
+from ..services import workflow_result_cache
+from .dependencies import get_execution_or_404, get_multi_agent_workflow_or_404
 from ..schemas import (
     MultiAgentWorkflowCreate,
     MultiAgentWorkflowUpdate,
@@ -26,10 +35,47 @@ router = APIRouter(
 )
 
 
+def _referenced_agent_ids(workflow_definition):
+    """Agent ids referenced by a workflow definition's nodes."""
+    nodes = (workflow_definition or {}).get("nodes") or []
+    return {
+        node["agent_id"]
+        for node in nodes
+        if isinstance(node, dict) and node.get("agent_id") is not None
+    }
+
+
+async def _sync_agent_refs(db: AsyncSession, workflow_id: int, workflow_definition) -> None:
+    """
+    Bring workflow_agent_refs in line with the definition's node agents.
+
+    Runs in the caller's transaction: drops refs no longer present, then
+    upserts the current set with ON CONFLICT DO NOTHING. Keeping this
+    index current at write time is what lets delete_agent's guards be
+    plain indexed lookups.
+    """
+    agent_ids = _referenced_agent_ids(workflow_definition)
+
+    stale = delete(workflow_agent_refs).where(workflow_agent_refs.c.workflow_id == workflow_id)
+    if agent_ids:
+        stale = stale.where(workflow_agent_refs.c.agent_id.not_in(agent_ids))
+    await db.execute(stale)
+
+    if agent_ids:
+        await db.execute(
+            pg_insert(workflow_agent_refs)
+            .values([
+                {"workflow_id": workflow_id, "agent_id": agent_id}
+                for agent_id in sorted(agent_ids)
+            ])
+            .on_conflict_do_nothing()
+        )
+
+
 @router.post("/", response_model=MultiAgentWorkflowSchema)
 async def create_workflow(
     workflow_data: MultiAgentWorkflowCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new multi-agent workflow.
@@ -40,16 +86,25 @@ async def create_workflow(
     if workflow_data.workflow_definition:
         workflow_def_dict = workflow_data.workflow_definition.model_dump()
 
-    db_workflow = MultiAgentWorkflow(
-        name=workflow_data.name,
-        description=workflow_data.description,
-        workflow_definition=workflow_def_dict,
-        status=MultiAgentWorkflowStatus.DRAFT
-    )
+    # INSERT ... RETURNING hands back the final row (including
+    # database-stamped timestamps) without a refresh SELECT
+    db_workflow = (
+        await db.execute(
+            insert(MultiAgentWorkflow)
+            .values(
+                name=workflow_data.name,
+                description=workflow_data.description,
+                workflow_definition=workflow_def_dict,
+                status=MultiAgentWorkflowStatus.DRAFT,
+            )
+            .returning(MultiAgentWorkflow)
+        )
+    ).scalar_one()
 
-    db.add(db_workflow)
-    db.commit()
-    db.refresh(db_workflow)
+    if workflow_def_dict:
+        await _sync_agent_refs(db, db_workflow.id, workflow_def_dict)
+
+    await db.commit()
 
     return db_workflow
 
@@ -58,35 +113,29 @@ async def create_workflow(
 async def list_workflows(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all multi-agent workflows, ordered by most recently updated.
     """
-    workflows = db.query(MultiAgentWorkflow)\
-        .order_by(desc(MultiAgentWorkflow.updated_at))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
-
-    return workflows
+    result = await db.execute(
+        select(MultiAgentWorkflow)
+        .order_by(desc(MultiAgentWorkflow.updated_at))
+        .offset(skip)
+        .limit(limit)
+    )
+    # workflow_definition blobs are large; hand them straight to orjson
+    # instead of re-validating through the response model
+    return ORJSONResponse([model_to_dict(workflow) for workflow in result.scalars()])
 
 
 @router.get("/{workflow_id}", response_model=MultiAgentWorkflowSchema)
 async def get_workflow(
-    workflow_id: int,
-    db: Session = Depends(get_db)
+    workflow: MultiAgentWorkflow = Depends(get_multi_agent_workflow_or_404)
 ):
     """
     Get a specific multi-agent workflow by ID.
     """
-    workflow = db.query(MultiAgentWorkflow)\
-        .filter(MultiAgentWorkflow.id == workflow_id)\
-        .first()
-
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-
     return workflow
 
 
@@ -94,45 +143,58 @@ async def get_workflow(
 async def update_workflow(
     workflow_id: int,
     workflow_update: MultiAgentWorkflowUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update an existing multi-agent workflow.
     Can update name, description, workflow_definition, or status.
     """
-    workflow = db.query(MultiAgentWorkflow)\
-        .filter(MultiAgentWorkflow.id == workflow_id)\
-        .first()
-
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
+    changes = {}
 
-    # Update fields if provided
     if workflow_update.name is not None:
-        workflow.name = workflow_update.name
+        changes["name"] = workflow_update.name
 
     if workflow_update.description is not None:
-        workflow.description = workflow_update.description
+        changes["description"] = workflow_update.description
 
     if workflow_update.workflow_definition is not None:
-        workflow.workflow_definition = workflow_update.workflow_definition.model_dump()
-
-        # Automatically set status to ACTIVE if workflow has nodes and is currently DRAFT
-        # Only apply auto-activation if status wasn't explicitly provided
-        if workflow_update.status is None:
-            if (workflow.status == MultiAgentWorkflowStatus.DRAFT and
-                workflow.workflow_definition.get('nodes') and
-                len(workflow.workflow_definition['nodes']) > 0):
-                workflow.status = MultiAgentWorkflowStatus.ACTIVE
+        changes["workflow_definition"] = workflow_update.workflow_definition.model_dump()
 
     # Explicit status updates always take precedence over auto-activation
     if workflow_update.status is not None:
-        workflow.status = MultiAgentWorkflowStatus(workflow_update.status)
+        changes["status"] = MultiAgentWorkflowStatus(workflow_update.status)
+    elif changes.get("workflow_definition", {}).get("nodes"):
+        # Automatically set status to ACTIVE if the new definition has nodes
+        # and the workflow is currently DRAFT; the CASE keeps the check in
+        # the same statement instead of requiring a prior SELECT
+        changes["status"] = case(
+            (MultiAgentWorkflow.status == MultiAgentWorkflowStatus.DRAFT,
+             MultiAgentWorkflowStatus.ACTIVE.value),
+            else_=MultiAgentWorkflow.status,
+        )
+
+    # Single UPDATE ... RETURNING: Postgres applies the changes and hands the
+    # final row back without a follow-up SELECT/refresh round trip
+    workflow = (
+        await db.execute(
+            update(MultiAgentWorkflow)
+            .where(MultiAgentWorkflow.id == workflow_id)
+            .values(**changes, updated_at=func.now())
+            .returning(MultiAgentWorkflow)
+            .execution_options(synchronize_session=False)
+        )
+    ).scalar_one_or_none()
+
+    if workflow is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
 
-    workflow.updated_at = datetime.utcnow()
+    if workflow_update.workflow_definition is not None:
+        await _sync_agent_refs(db, workflow_id, changes["workflow_definition"])
+
+    await db.commit()
 
-    db.commit()
-    db.refresh(workflow)
+    # The definition may have changed, so cached execution results are stale
+    workflow_result_cache.invalidate("workflow", workflow_id)
 
     return workflow
 
@@ -141,7 +203,7 @@ async def update_workflow(
 async def delete_workflow(
     workflow_id: int,
     force: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a multi-agent workflow and all its executions.
@@ -150,127 +212,199 @@ async def delete_workflow(
     - force: If True, cancels running executions and deletes anyway
              If False, prevents deletion if there are running executions
     """
-    workflow = db.query(MultiAgentWorkflow)\
-        .filter(MultiAgentWorkflow.id == workflow_id)\
-        .first()
-
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
+    # One round trip fetches the name (all we need from the row) and an
+    # EXISTS probe for running executions, which aborts at the first match
+    # instead of counting them all; no need to hydrate the full workflow
+    # with its definition JSON
+    running_filter = (
+        MultiAgentWorkflowExecution.workflow_id == workflow_id,
+        MultiAgentWorkflowExecution.status.in_([
+            MultiAgentWorkflowExecutionStatus.PENDING,
+            MultiAgentWorkflowExecutionStatus.RUNNING
+        ])
+    )
 
-    # Check for running executions
-    running_executions = db.query(MultiAgentWorkflowExecution)\
-        .filter(
-            MultiAgentWorkflowExecution.workflow_id == workflow_id,
-            MultiAgentWorkflowExecution.status.in_([
-                MultiAgentWorkflowExecutionStatus.PENDING,
-                MultiAgentWorkflowExecutionStatus.RUNNING
-            ])
+    row = (
+        await db.execute(
+            select(
+                MultiAgentWorkflow.name,
+                select(MultiAgentWorkflowExecution.id).where(*running_filter).exists(),
+            )
+            .where(MultiAgentWorkflow.id == workflow_id)
         )
+    ).one_or_none()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
 
-    running_count = running_executions.count()
+    workflow_name, has_running = row
 
-    if running_count > 0 and not force:
+    if has_running and not force:
+        # Count only needed for the error message
+        running_count = (
+            await db.execute(
+                select(func.count(MultiAgentWorkflowExecution.id)).where(*running_filter)
+            )
+        ).scalar_one()
         raise HTTPException(
             status_code=400,
-            detail=f"Cannot delete workflow '{workflow.name}'. It has {running_count} running execution(s). Use force=true to cancel and delete anyway."
+            detail=f"Cannot delete workflow '{workflow_name}'. It has {running_count} running execution(s). Use force=true to cancel and delete anyway."
         )
 
-    # If force=true, cancel all running executions first
-    if running_count > 0 and force:
-        running_executions.update({
-            "status": MultiAgentWorkflowExecutionStatus.FAILED,
-            "error": "Execution canceled due to workflow deletion",
-            "completed_at": datetime.utcnow()
-        }, synchronize_session=False)
-
-    # Store workflow name before expunging
-    workflow_name = workflow.name
+    # Delete all executions and the workflow in the same transaction. With
+    # force=true the running executions are simply deleted along with the
+    # rest; there is no point updating rows that are removed moments later
+    await db.execute(
+        delete(MultiAgentWorkflowExecution)
+        .where(MultiAgentWorkflowExecution.workflow_id == workflow_id)
+        .execution_options(synchronize_session=False)
+    )
 
-    # Delete all executions first (including completed ones)
-    db.query(MultiAgentWorkflowExecution)\
-        .filter(MultiAgentWorkflowExecution.workflow_id == workflow_id)\
-        .delete(synchronize_session=False)
+    await db.execute(
+        delete(workflow_agent_refs).where(workflow_agent_refs.c.workflow_id == workflow_id)
+    )
 
-    # Expunge the workflow from session to prevent relationship tracking
-    db.expunge(workflow)
+    await db.execute(
+        delete(MultiAgentWorkflow)
+        .where(MultiAgentWorkflow.id == workflow_id)
+        .execution_options(synchronize_session=False)
+    )
 
-    # Delete the workflow using bulk delete instead of session delete
-    db.query(MultiAgentWorkflow)\
-        .filter(MultiAgentWorkflow.id == workflow_id)\
-        .delete(synchronize_session=False)
+    await db.commit()
 
-    db.commit()
+    workflow_result_cache.invalidate("workflow", workflow_id)
 
     return {"message": f"Workflow '{workflow_name}' deleted successfully"}
 
 
-@router.post("/{workflow_id}/execute", response_model=MultiAgentWorkflowExecutionSchema)
+async def _run_workflow_execution(workflow_id: int, execution_id: int, input_data):
+    """
+    Background task that drives a workflow execution to completion.
+
+    Runs after the HTTP response is sent, so it opens its own session
+    instead of reusing the (already closed) request-scoped one.
+    """
+    # Import executor here to avoid circular imports
+    from ..langgraph.multi_agent_executor import MultiAgentWorkflowExecutor
+
+    async with SessionLocal() as db:
+        workflow = await db.get(MultiAgentWorkflow, workflow_id)
+        execution = await db.get(MultiAgentWorkflowExecution, execution_id)
+        if workflow is None or execution is None:
+            return
+
+        executor = MultiAgentWorkflowExecutor(db)
+
+        try:
+            await db.execute(
+                update(MultiAgentWorkflowExecution)
+                .where(MultiAgentWorkflowExecution.id == execution_id)
+                .values(
+                    status=MultiAgentWorkflowExecutionStatus.RUNNING,
+                    started_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+            result = await executor.execute_workflow(
+                workflow=workflow,
+                execution=execution,
+                input_data=input_data
+            )
+
+            await db.execute(
+                update(MultiAgentWorkflowExecution)
+                .where(MultiAgentWorkflowExecution.id == execution_id)
+                .values(
+                    status=MultiAgentWorkflowExecutionStatus.COMPLETED,
+                    output_data=result.get("output_data"),
+                    node_results=result.get("node_results"),
+                    completed_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+            workflow_result_cache.put(
+                "workflow",
+                workflow_id,
+                input_data,
+                {"output_data": result.get("output_data"), "node_results": result.get("node_results")},
+            )
+
+        except Exception as e:
+            # Execution failures land in the row; the client sees them
+            # when polling the execution endpoint
+            await db.execute(
+                update(MultiAgentWorkflowExecution)
+                .where(MultiAgentWorkflowExecution.id == execution_id)
+                .values(
+                    status=MultiAgentWorkflowExecutionStatus.FAILED,
+                    error=str(e),
+                    completed_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+
+@router.post("/{workflow_id}/execute", response_model=MultiAgentWorkflowExecutionSchema, status_code=202)
 async def execute_workflow(
     workflow_id: int,
     execute_request: MultiAgentWorkflowExecuteRequest,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    workflow: MultiAgentWorkflow = Depends(get_multi_agent_workflow_or_404),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Execute a multi-agent workflow.
-    Creates an execution record and processes the workflow.
-    """
-    # Get workflow
-    workflow = db.query(MultiAgentWorkflow)\
-        .filter(MultiAgentWorkflow.id == workflow_id)\
-        .first()
-
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-
-    # Create execution record
-    execution = MultiAgentWorkflowExecution(
-        workflow_id=workflow_id,
-        status=MultiAgentWorkflowExecutionStatus.PENDING,
-        input_data=execute_request.input_data,
-        node_results={},
-    )
-
-    db.add(execution)
-    db.commit()
-    db.refresh(execution)
-
-    # Import executor here to avoid circular imports
-    from ..langgraph.multi_agent_executor import MultiAgentWorkflowExecutor
 
-    # Execute workflow
-    executor = MultiAgentWorkflowExecutor(db)
-
-    try:
-        execution.status = MultiAgentWorkflowExecutionStatus.RUNNING
-        execution.started_at = datetime.utcnow()
-        db.commit()
-
-        result = await executor.execute_workflow(
-            workflow=workflow,
-            execution=execution,
-            input_data=execute_request.input_data
+    Creates an execution record and schedules the workflow to run in the
+    background; the request returns 202 immediately with the PENDING row
+    instead of holding the connection open for a potentially minutes-long
+    LLM pipeline. Clients poll /executions/{id} for the result.
+    """
+    # Serve identical inputs from cache so repeated executions skip the
+    # LLM-backed executor. An execution row is still recorded for metrics.
+    cached = workflow_result_cache.get("workflow", workflow_id, execute_request.input_data)
+    if cached is not None:
+        execution = (
+            await db.execute(
+                insert(MultiAgentWorkflowExecution)
+                .values(
+                    workflow_id=workflow_id,
+                    status=MultiAgentWorkflowExecutionStatus.COMPLETED,
+                    input_data=execute_request.input_data,
+                    output_data=cached.get("output_data"),
+                    node_results=cached.get("node_results"),
+                    started_at=func.now(),
+                    completed_at=func.now(),
+                )
+                .returning(MultiAgentWorkflowExecution)
+            )
+        ).scalar_one()
+        await db.commit()
+        return execution
+
+    # Create execution record in one INSERT ... RETURNING round trip
+    execution = (
+        await db.execute(
+            insert(MultiAgentWorkflowExecution)
+            .values(
+                workflow_id=workflow_id,
+                status=MultiAgentWorkflowExecutionStatus.PENDING,
+                input_data=execute_request.input_data,
+                node_results={},
+            )
+            .returning(MultiAgentWorkflowExecution)
         )
+    ).scalar_one()
+    await db.commit()
 
-        # Update execution with results
-        execution.status = MultiAgentWorkflowExecutionStatus.COMPLETED
-        execution.output_data = result.get("output_data")
-        execution.node_results = result.get("node_results")
-        execution.completed_at = datetime.utcnow()
-        db.commit()
-        db.refresh(execution)
-
-    except Exception as e:
-        # Handle execution failure
-        execution.status = MultiAgentWorkflowExecutionStatus.FAILED
-        execution.error = str(e)
-        execution.completed_at = datetime.utcnow()
-        db.commit()
-        db.refresh(execution)
-
-        raise HTTPException(
-            status_code=500,
-            detail=f"Workflow execution failed: {str(e)}"
-        )
+    background_tasks.add_task(
+        _run_workflow_execution, workflow_id, execution.id, execute_request.input_data
+    )
 
     return execution
 
@@ -280,36 +414,28 @@ async def get_workflow_executions(
     workflow_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all executions for a specific workflow.
     """
-    executions = db.query(MultiAgentWorkflowExecution)\
-        .filter(MultiAgentWorkflowExecution.workflow_id == workflow_id)\
-        .order_by(desc(MultiAgentWorkflowExecution.created_at))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
-
-    return executions
+    result = await db.execute(
+        select(MultiAgentWorkflowExecution)
+        .where(MultiAgentWorkflowExecution.workflow_id == workflow_id)
+        .order_by(desc(MultiAgentWorkflowExecution.created_at))
+        .offset(skip)
+        .limit(limit)
+    )
+    return ORJSONResponse([model_to_dict(execution) for execution in result.scalars()])
 
 
 @router.get("/executions/{execution_id}", response_model=MultiAgentWorkflowExecutionSchema)
 async def get_execution(
-    execution_id: int,
-    db: Session = Depends(get_db)
+    execution: MultiAgentWorkflowExecution = Depends(get_execution_or_404)
 ):
     """
     Get a specific workflow execution by ID.
     """
-    execution = db.query(MultiAgentWorkflowExecution)\
-        .filter(MultiAgentWorkflowExecution.id == execution_id)\
-        .first()
-
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
     return execution
 
 
@@ -317,18 +443,20 @@ async def get_execution(
 async def cancel_execution(
     workflow_id: int,
     execution_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Cancel a running or pending workflow execution.
     Changes status to FAILED with cancellation message.
     """
-    execution = db.query(MultiAgentWorkflowExecution)\
-        .filter(
-            MultiAgentWorkflowExecution.id == execution_id,
-            MultiAgentWorkflowExecution.workflow_id == workflow_id
-        )\
-        .first()
+    execution = (
+        await db.execute(
+            select(MultiAgentWorkflowExecution).where(
+                MultiAgentWorkflowExecution.id == execution_id,
+                MultiAgentWorkflowExecution.workflow_id == workflow_id
+            )
+        )
+    ).scalar_one_or_none()
 
     if not execution:
         raise HTTPException(status_code=404, detail="Execution not found")
@@ -343,12 +471,21 @@ async def cancel_execution(
             detail=f"Cannot cancel execution with status '{execution.status}'. Only PENDING or RUNNING executions can be canceled."
         )
 
-    # Update execution status to FAILED with cancellation message
-    execution.status = MultiAgentWorkflowExecutionStatus.FAILED
-    execution.error = "Execution canceled by user"
-    execution.completed_at = datetime.utcnow()
-
-    db.commit()
-    db.refresh(execution)
+    # Update execution status to FAILED with cancellation message; the
+    # RETURNING clause brings back the stamped row in the same round trip
+    execution = (
+        await db.execute(
+            update(MultiAgentWorkflowExecution)
+            .where(MultiAgentWorkflowExecution.id == execution_id)
+            .values(
+                status=MultiAgentWorkflowExecutionStatus.FAILED,
+                error="Execution canceled by user",
+                completed_at=func.now(),
+            )
+            .returning(MultiAgentWorkflowExecution)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+    ).scalar_one()
+    await db.commit()
 
     return {"message": f"Execution {execution_id} canceled successfully", "execution": execution}
@@ -5,16 +5,16 @@ Endpoints for managing and executing MCP tools/connectors.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 
-from ..mcp import ToolRegistry, ToolExecutor, ToolMetadata
+from ..mcp import ToolExecutor, ToolMetadata, registry
 from ..mcp.base_tool import ToolExecutionResult
 
 router = APIRouter()
 
-# Initialize registry and executor
-registry = ToolRegistry()
+# Executor bound to the shared application registry
 executor = ToolExecutor(registry)
 
 
@@ -92,12 +92,15 @@ async def execute_tool(request: ToolExecuteRequest):
         config=request.config
     )
 
-    return ToolExecuteResponse(
-        success=result.success,
-        data=result.data,
-        error=result.error,
-        metadata=result.metadata
-    )
+    # The executor already produced a validated ToolExecutionResult;
+    # serialize it directly instead of re-validating through the response
+    # model. response_model above still documents the shape.
+    return ORJSONResponse({
+        "success": result.success,
+        "data": result.data,
+        "error": result.error,
+        "metadata": result.metadata,
+    })
 
 
 @router.get("/openai/format")
@@ -127,16 +130,4 @@ async def get_registry_stats():
     Returns:
         Registry statistics
     """
-    all_tools = registry.list_tools(enabled_only=False)
-    enabled_tools = registry.list_tools(enabled_only=True)
-
-    categories = {}
-    for tool in all_tools:
-        categories[tool.category] = categories.get(tool.category, 0) + 1
-
-    return {
-        "total_tools": len(all_tools),
-        "enabled_tools": len(enabled_tools),
-        "disabled_tools": len(all_tools) - len(enabled_tools),
-        "categories": categories
-    }
+    return registry.stats()
@@ -5,14 +5,16 @@ Handles execution of autonomous agent workflows and tool invocations.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Dict, Any, List
-from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..mcp.registry import registry  # Import the singleton registry only
 from .. import models, schemas
-from ..db import get_db
-from ..services import LLMService
+from ..db import get_db, model_to_dict
+from ..services import LLMService, get_llm_service, workflow_result_cache
+from .dependencies import get_agent_or_404, get_workflow_or_404
 
 router = APIRouter(prefix="/api/workflows", tags=["workflows"])
 
@@ -23,25 +25,26 @@ class ToolExecutionRequest(BaseModel):
 
 
 @router.get("/", response_model=List[schemas.Workflow])
-async def list_workflows(db: Session = Depends(get_db)):
+async def list_workflows(db: AsyncSession = Depends(get_db)):
     """List all workflow executions"""
-    workflows = db.query(models.Workflow).all()
-    return workflows
+    result = await db.execute(select(models.Workflow))
+    # Rows carry large input/output JSON blobs; serialize them straight to
+    # orjson instead of re-validating through the response model
+    return ORJSONResponse([model_to_dict(workflow) for workflow in result.scalars()])
 
 
 @router.get("/agent/{agent_id}", response_model=List[schemas.Workflow])
-async def list_agent_workflows(agent_id: int, db: Session = Depends(get_db)):
+async def list_agent_workflows(agent_id: int, db: AsyncSession = Depends(get_db)):
     """List all workflow executions for a specific agent"""
-    workflows = db.query(models.Workflow).filter(models.Workflow.agent_id == agent_id).all()
-    return workflows
+    result = await db.execute(
+        select(models.Workflow).where(models.Workflow.agent_id == agent_id)
+    )
+    return ORJSONResponse([model_to_dict(workflow) for workflow in result.scalars()])
 
 
 @router.get("/workflow/{workflow_id}", response_model=schemas.Workflow)
-async def get_workflow(workflow_id: int, db: Session = Depends(get_db)):
+async def get_workflow(workflow: models.Workflow = Depends(get_workflow_or_404)):
     """Get a specific workflow execution by ID"""
-    workflow = db.query(models.Workflow).filter(models.Workflow.id == workflow_id).first()
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
     return workflow
 
 
@@ -93,17 +96,14 @@ async def execute_tool_route(tool_id: str, request: ToolExecutionRequest):
 async def execute_agent_workflow(
     agent_id: int,
     request: schemas.WorkflowExecuteRequest,
-    db: Session = Depends(get_db)
+    agent: models.Agent = Depends(get_agent_or_404),
+    db: AsyncSession = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service)
 ):
     """
     Execute a deployed agent as a workflow with given input data.
     This endpoint handles web scraping or other tool-enabled agents.
     """
-    # Get the agent
-    agent = db.query(models.Agent).filter(models.Agent.id == agent_id).first()
-    if not agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
-
     # Check if agent is deployed
     if agent.status != models.AgentStatus.DEPLOYED:
         raise HTTPException(
@@ -111,26 +111,46 @@ async def execute_agent_workflow(
             detail=f"Agent must be deployed before execution. Current status: {agent.status}"
         )
 
-    # Create workflow record
-    workflow = models.Workflow(
-        agent_id=agent_id,
-        status=models.WorkflowStatus.PENDING,
-        input_data=request.input_data,
-        created_at=datetime.utcnow()
-    )
-    db.add(workflow)
-    db.commit()
-    db.refresh(workflow)
+    # Serve identical inputs from cache: LLM calls dominate latency and cost,
+    # so a hit skips the executor entirely. A workflow row is still recorded
+    # (with processing_mode="cache_hit") so metrics keep tracking usage.
+    cached_output = workflow_result_cache.get("agent", agent_id, request.input_data)
+    if cached_output is not None:
+        workflow = (
+            await db.execute(
+                insert(models.Workflow)
+                .values(
+                    agent_id=agent_id,
+                    status=models.WorkflowStatus.COMPLETED,
+                    input_data=request.input_data,
+                    output_data={**cached_output, "processing_mode": "cache_hit"},
+                    started_at=func.now(),
+                    completed_at=func.now(),
+                )
+                .returning(models.Workflow)
+            )
+        ).scalar_one()
+        await db.commit()
+        return workflow
 
-    # Update workflow status to running
-    workflow.status = models.WorkflowStatus.RUNNING
-    workflow.started_at = datetime.utcnow()
-    db.commit()
+    # The executor runs inline, so the row is born RUNNING: one
+    # INSERT ... RETURNING instead of a PENDING insert followed by a
+    # separate RUNNING transition, with timestamps stamped by the database
+    workflow = (
+        await db.execute(
+            insert(models.Workflow)
+            .values(
+                agent_id=agent_id,
+                status=models.WorkflowStatus.RUNNING,
+                input_data=request.input_data,
+                started_at=func.now(),
+            )
+            .returning(models.Workflow)
+        )
+    ).scalar_one()
+    await db.commit()
 
     try:
-        # Initialize LLM service
-        llm_service = LLMService()
-
         # Execute agent workflow with LLM integration
         result = await llm_service.execute_agent_workflow(
             agent=agent,
@@ -140,27 +160,51 @@ async def execute_agent_workflow(
 
         # Prepare output data
         output_data = {
-            "content": result["content"],
-            "tool_results": result.get("tool_results", {}),
-            "processing_mode": result.get("processing_mode", "direct"),
+            "content": result.content,
+            "tool_results": result.tool_results,
+            "processing_mode": result.processing_mode,
             "input_data": request.input_data,
             "agent_name": agent.agent_name,
         }
 
-        # Mark workflow as completed
-        workflow.status = models.WorkflowStatus.COMPLETED
-        workflow.output_data = output_data
-        workflow.completed_at = datetime.utcnow()
-        db.commit()
-        db.refresh(workflow)
+        # Mark completed in one UPDATE ... RETURNING: Postgres stamps
+        # completed_at and hands the final row back without a refresh
+        workflow = (
+            await db.execute(
+                update(models.Workflow)
+                .where(models.Workflow.id == workflow.id)
+                .values(
+                    status=models.WorkflowStatus.COMPLETED,
+                    output_data=output_data,
+                    completed_at=func.now(),
+                )
+                .returning(models.Workflow)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+        ).scalar_one()
+        await db.commit()
+
+        # The executor reports failures as result dicts with error set
+        # rather than raising; don't memoize those, or a transient LLM
+        # failure replays as a cache hit for the full TTL. Tool-backed
+        # results (web scrapes) aren't safely replayable either, matching
+        # the service-level cache guard
+        if not result.error and not agent.tools_enabled:
+            workflow_result_cache.put("agent", agent_id, request.input_data, output_data)
 
         return workflow
 
     except Exception as e:
         # Handle execution errors
-        workflow.status = models.WorkflowStatus.FAILED
-        workflow.error = str(e)
-        workflow.completed_at = datetime.utcnow()
-        db.commit()
-        db.refresh(workflow)
+        await db.execute(
+            update(models.Workflow)
+            .where(models.Workflow.id == workflow.id)
+            .values(
+                status=models.WorkflowStatus.FAILED,
+                error=str(e),
+                completed_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
@@ -1,4 +1,13 @@
 """Services module for business logic."""
-from .llm_service import LLMService
+from .llm_service import AgentWorkflowResult, LLMService, get_llm_service
+from .result_cache import TTLCache, WorkflowResultCache, agent_read_cache, workflow_result_cache
 
-__all__ = ["LLMService"]
+__all__ = [
+    "AgentWorkflowResult",
+    "LLMService",
+    "get_llm_service",
+    "TTLCache",
+    "WorkflowResultCache",
+    "agent_read_cache",
+    "workflow_result_cache",
+]
@@ -2,10 +2,107 @@
 LLM Service for processing agent workflows with LangGraph orchestration.
 Provides a clean interface for executing agents with integrated tool calling.
 """
+import asyncio
+import functools
+import hashlib
 import os
-from typing import Dict, Any, List, Optional
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional, Set, Tuple
+
+import orjson
 from ..langgraph import LangGraphExecutor
 from ..models import Agent
+from .result_cache import TTLCache
+
+
+# Executors shared across LLMService instances, keyed by API key. Callers
+# that construct LLMService per request (e.g. request-scoped dependency
+# injection) would otherwise build a fresh executor each time; one executor
+# per key keeps its state unified for the process.
+_EXECUTOR_CACHE: Dict[str, LangGraphExecutor] = {}
+_EXECUTOR_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_api_key(explicit: Optional[str] = None) -> str:
+    """
+    Resolve and validate the OpenAI API key once per process.
+
+    Request-scoped construction of LLMService would otherwise re-read the
+    environment and re-validate on every request; failures are not cached,
+    so a missing key keeps raising until the environment is fixed.
+    """
+    key = explicit or os.getenv("OPENAI_API_KEY")
+    if not key:
+        raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
+    return key
+
+
+@dataclass(slots=True)
+class AgentWorkflowResult:
+    """
+    Result of one agent workflow execution.
+
+    Slots-backed with a fixed field set, so high-QPS paths avoid the
+    allocation and per-key hashing of an arbitrary result dict and
+    serialization walks a known attribute order.
+    """
+
+    content: str
+    tool_results: Dict[str, Any]
+    messages: List[Dict[str, Any]]
+    error: Optional[str]
+    processing_mode: str = "langgraph"
+    short_circuit: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict view for JSON serialization and storage."""
+        return {
+            "content": self.content,
+            "tool_results": self.tool_results,
+            "messages": self.messages,
+            "error": self.error,
+            "processing_mode": self.processing_mode,
+            "short_circuit": self.short_circuit,
+        }
+
+
+@dataclass(frozen=True, eq=False, slots=True)
+class FrozenToolConfig(Mapping):
+    """
+    Immutable tool configuration with a precomputed fingerprint.
+
+    Reads like a plain read-only mapping, so existing consumers are
+    unaffected; the fingerprint lets the executor key its graph cache and
+    skip tool resolution without deep-comparing the underlying dicts.
+    """
+
+    mapping: Mapping[str, Any]
+    fingerprint: bytes
+
+    def __getitem__(self, key: str) -> Any:
+        return self.mapping[key]
+
+    def __iter__(self):
+        return iter(self.mapping)
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint)
+
+
+def _shared_executor(api_key: str) -> LangGraphExecutor:
+    """Return the process-wide executor for this key, creating it on a miss."""
+    with _EXECUTOR_LOCK:
+        executor = _EXECUTOR_CACHE.get(api_key)
+        if executor is None:
+            executor = LangGraphExecutor(api_key=api_key)
+            _EXECUTOR_CACHE[api_key] = executor
+        return executor
 
 
 class LLMService:
@@ -14,25 +111,127 @@ class LLMService:
 
     This service provides a high-level interface for executing agents
     with automatic tool orchestration, state management, and conversation flow.
+
+    Executions are funnelled through a small coalescer: calls arriving
+    within a short window are drained as one batch and dispatched
+    concurrently, so N independent requests overlap their LLM round-trips
+    instead of paying N sequential network RTTs. Fan-out is bounded by a
+    semaphore.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0,
+        max_concurrent_tasks: int = 8,
+    ):
         """Initialize LLM service with LangGraph executor."""
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
+        self.api_key = _resolve_api_key(api_key)
+
+        # The key is injected into the executor (and from there into each
+        # ChatOpenAI) rather than written into os.environ, so overlapping
+        # services can use different keys without fighting over globals
+        self.executor = _shared_executor(self.api_key)
+
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._semaphore = asyncio.Semaphore(max_concurrent_tasks)
+        self._queue: "asyncio.Queue[Tuple[Agent, Dict[str, Any], Optional[List[Dict[str, str]]], asyncio.Future]]" = asyncio.Queue()
+        # Started lazily on first call so construction does not require a
+        # running event loop
+        self._coalescer: Optional[asyncio.Task] = None
+        # Strong references to dispatched batches; without them the event
+        # loop may garbage-collect a still-running task
+        self._inflight_batches: Set[asyncio.Task] = set()
 
-        # Set API key for LangChain/OpenAI
-        os.environ["OPENAI_API_KEY"] = self.api_key
+        # Tool configs rarely change between calls for the same agent;
+        # cache the built config per agent id, fingerprinted on the
+        # source config so an updated agent rebuilds it
+        self._tool_config_cache: Dict[int, FrozenToolConfig] = {}
 
-        self.executor = LangGraphExecutor()
+        # Memoized executor responses for repeated identical inputs, keyed
+        # on agent id + a fingerprint of its prompt-affecting config so an
+        # edited agent misses automatically. Only used for tool-less,
+        # history-less calls, where replaying the response is safe.
+        self._response_cache = TTLCache(ttl=300.0, max_entries=256)
+
+        # Snapshot of the registry's tool list, taken lazily on first read
+        # (tools are registered during app startup, which may run after
+        # this service is constructed). refresh_tools() rebuilds it.
+        self._tools_snapshot: Optional[Tuple[Dict[str, Any], ...]] = None
+        self._tools_etag: Optional[str] = None
+
+    def _ensure_coalescer(self) -> None:
+        """Start (or restart) the background coalescer task if needed."""
+        if self._coalescer is None or self._coalescer.done():
+            self._coalescer = asyncio.create_task(self._drain_queue())
+
+    async def _drain_queue(self) -> None:
+        """
+        Background loop: wait for one pending call, collect any others that
+        arrive within max_wait_ms (up to max_batch_size), and dispatch the
+        batch concurrently.
+
+        Batches are dispatched as tasks rather than awaited here, so one
+        slow run (a minutes-long scrape, say) never head-of-line blocks the
+        next window; the semaphore alone bounds total concurrency.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._run_batch(batch))
+            self._inflight_batches.add(task)
+            task.add_done_callback(self._inflight_batches.discard)
+
+    async def _run_batch(self, batch: List[Tuple]) -> None:
+        """Run one drained batch concurrently; futures carry the outcomes."""
+        await asyncio.gather(
+            *(self._run_item(item) for item in batch),
+            return_exceptions=True,
+        )
+
+    async def _run_item(self, item) -> None:
+        """Execute one queued call and deliver the outcome to its future."""
+        agent, user_input, conversation_history, future = item
+        async with self._semaphore:
+            try:
+                # Per-request setup runs concurrently: today both coros are
+                # near-instant, but config fetched from a remote store or a
+                # history rewrite would overlap instead of serializing.
+                # gather rather than TaskGroup - the deploy images run 3.10
+                tool_config, history = await asyncio.gather(
+                    self._build_tool_config_async(agent),
+                    self._normalize_history(conversation_history),
+                )
+                result = await self.executor.execute_agent(
+                    agent_model=agent,
+                    user_input=user_input,
+                    conversation_history=history,
+                    tool_config=tool_config,
+                )
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
 
     async def execute_agent_workflow(
         self,
         agent: Agent,
         user_input: Dict[str, Any],
         conversation_history: Optional[List[Dict[str, str]]] = None
-    ) -> Dict[str, Any]:
+    ) -> AgentWorkflowResult:
         """
         Execute an agent workflow using LangGraph.
 
@@ -42,36 +241,160 @@ class LLMService:
             conversation_history: Optional conversation history for context
 
         Returns:
-            Dict containing:
-                - content: Final agent response
-                - tool_results: Dictionary of tool execution results
-                - messages: Full conversation messages
-                - error: Error message if execution failed
-                - processing_mode: Always "langgraph"
-        """
-        # Prepare tool configuration
-        tool_config = self._build_tool_config(agent)
-
-        # Execute agent using LangGraph
-        result = await self.executor.execute_agent(
-            agent_model=agent,
-            user_input=user_input,
-            conversation_history=conversation_history,
-            tool_config=tool_config
-        )
+            AgentWorkflowResult with the final response, tool results,
+            conversation messages and any execution error; to_dict() gives
+            the plain-dict view for storage.
+        """
+        # Empty or whitespace-only input cannot produce a meaningful
+        # response; answer it locally instead of spending an LLM round-trip.
+        # The frontend posts arbitrary template keys ({"input": ...},
+        # {"input": ..., "url": ...}), so probe every value rather than
+        # assuming specific names - any non-blank value is real input.
+        # getattr keeps the door open for a future Agent.allow_empty_input
+        # column without requiring one now.
+        if all(
+            value is None or not str(value).strip()
+            for value in user_input.values()
+        ) and not getattr(agent, "allow_empty_input", False):
+            return AgentWorkflowResult(
+                content="",
+                tool_results={},
+                messages=conversation_history or [],
+                error=None,
+                short_circuit=True,
+            )
+
+        # Replay memoized responses for identical inputs. Tool-enabled
+        # agents bypass the cache (tool calls may have side effects), as
+        # do calls carrying conversation history (context-dependent).
+        cache_key = None
+        if not agent.tools_enabled and conversation_history is None:
+            cache_key = (
+                agent.id,
+                self._agent_fingerprint(agent),
+                orjson.dumps(user_input, option=orjson.OPT_SORT_KEYS),
+            )
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        self._ensure_coalescer()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((agent, user_input, conversation_history, future))
+        result = AgentWorkflowResult(**await future)
+
+        if cache_key is not None and not result.error:
+            self._response_cache.put(cache_key, result)
 
         return result
 
-    def _build_tool_config(self, agent: Agent) -> Dict[str, Any]:
+    async def execute_agent_workflow_stream(
+        self,
+        agent: Agent,
+        user_input: Dict[str, Any],
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute an agent workflow, yielding chunks as the graph emits them.
+
+        Intended for SSE/WebSocket handlers that want to start transmitting
+        tokens while tools are still running. Streams bypass the coalescer
+        (partial output cannot be batched) but still count against the
+        concurrency semaphore, and are never served from or written to the
+        response cache.
+
+        Yields:
+            Dicts with one of "delta", "tool_results_partial" or "error" -
+            see LangGraphExecutor.execute_agent_stream.
+        """
+        async with self._semaphore:
+            async for chunk in self.executor.execute_agent_stream(
+                agent_model=agent,
+                user_input=user_input,
+                conversation_history=conversation_history,
+                tool_config=await self._build_tool_config_async(agent),
+            ):
+                yield chunk
+
+    @staticmethod
+    def _agent_fingerprint(agent: Agent) -> bytes:
+        """Fingerprint of the agent fields that shape the LLM response."""
+        return orjson.dumps(
+            {
+                "system_prompt": agent.system_prompt,
+                "user_prompt_template": agent.user_prompt_template,
+                "additional_instructions": agent.additional_instructions,
+                "temperature": agent.temperature,
+                "max_tokens": agent.max_tokens,
+                "web_scraper_config": agent.web_scraper_config,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+
+    async def execute_agent_workflow_batch(
+        self,
+        agent: Agent,
+        inputs: List[Dict[str, Any]],
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> List[AgentWorkflowResult]:
+        """
+        Execute one agent against several inputs concurrently.
+
+        Enqueues every input in the same coalescing window and awaits all
+        results; individual failures surface as raised exceptions from the
+        corresponding gather slot.
+        """
+        self._ensure_coalescer()
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in inputs]
+        for user_input, future in zip(inputs, futures):
+            await self._queue.put((agent, user_input, conversation_history, future))
+        return [AgentWorkflowResult(**result) for result in await asyncio.gather(*futures)]
+
+    async def _build_tool_config_async(self, agent: Agent) -> FrozenToolConfig:
+        """
+        Async entry point for tool-config construction.
+
+        Today this is a thin wrapper over the synchronous build, but it
+        gives remote-config lookups (DB, KV store) a place to await
+        without changing any caller.
+        """
+        return self._build_tool_config(agent)
+
+    @staticmethod
+    async def _normalize_history(
+        conversation_history: Optional[List[Dict[str, str]]]
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        Async entry point for history preparation.
+
+        Pass-through for now; a future history rewrite (trimming,
+        summarization, retrieval) can await here and overlap with the
+        tool-config build.
+        """
+        return conversation_history
+
+    def _build_tool_config(self, agent: Agent) -> FrozenToolConfig:
         """
         Build tool configuration from agent settings and environment.
 
+        The result is cached per agent, keyed on a fingerprint of the
+        source config, and returned as a frozen mapping carrying that
+        fingerprint so the executor can compare configs in O(1) instead of
+        deep-equal.
+
         Args:
             agent: Agent model instance
 
         Returns:
-            Dictionary of tool configurations
+            Frozen, fingerprinted mapping of tool configurations
         """
+        fingerprint = orjson.dumps(agent.web_scraper_config, option=orjson.OPT_SORT_KEYS)
+
+        cached = self._tool_config_cache.get(agent.id)
+        if cached is not None and cached.fingerprint == fingerprint:
+            return cached
+
         tool_config = {}
 
         # Extract web scraper config if available
@@ -80,13 +403,55 @@ class LLMService:
 
         # Add any other tool-specific configs here as needed
 
-        return tool_config
+        frozen = FrozenToolConfig(MappingProxyType(tool_config), fingerprint)
+        self._tool_config_cache[agent.id] = frozen
+        return frozen
 
-    def get_available_tools(self) -> List[Dict[str, Any]]:
+    def get_available_tools(self) -> Tuple[Dict[str, Any], ...]:
         """
-        Get list of all available tools in the registry.
+        Get the available tools in the registry.
+
+        The registry is static for the process lifetime, so the list is
+        snapshotted once and the same tuple is returned on every call
+        instead of re-walking the registry per request.
 
         Returns:
-            List of tool metadata dictionaries
+            Tuple of tool metadata dictionaries
         """
-        return self.executor.get_available_tools()
+        if self._tools_snapshot is None:
+            self.refresh_tools()
+        return self._tools_snapshot
+
+    def get_available_tools_etag(self) -> str:
+        """Opaque tag for the current tool snapshot, usable as an HTTP ETag."""
+        if self._tools_etag is None:
+            self.refresh_tools()
+        return self._tools_etag
+
+    def refresh_tools(self) -> None:
+        """Rebuild the tool snapshot after runtime registry changes."""
+        self._tools_snapshot = tuple(self.executor.get_available_tools())
+        self._tools_etag = hashlib.blake2s(
+            orjson.dumps(self._tools_snapshot)
+        ).hexdigest()
+
+    @classmethod
+    def reset_executors(cls) -> None:
+        """Drop all shared executors (intended for tests)."""
+        with _EXECUTOR_LOCK:
+            _EXECUTOR_CACHE.clear()
+
+
+# Shared service instance, created lazily on first use. Constructing
+# LLMService per request re-reads config and rebuilds the executor; it is
+# also not built at import time because the constructor requires
+# OPENAI_API_KEY to be present.
+_llm_service: Optional[LLMService] = None
+
+
+def get_llm_service() -> LLMService:
+    """FastAPI dependency returning the process-wide LLMService."""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
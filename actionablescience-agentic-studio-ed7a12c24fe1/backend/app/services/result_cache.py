@@ -0,0 +1,107 @@
+"""
+In-process result cache for agent and multi-agent workflow executions.
+
+LLM calls dominate both latency and cost, so repeated executions with
+identical input can be answered from cache without touching the executor.
+Keys are exact matches on the normalized input payload (sorted-key JSON),
+scoped by a namespace ("agent" / "workflow") and the owning row's id so
+that updating an agent or workflow definition can invalidate its entries.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+_CACHE_MAX = 256
+
+
+class WorkflowResultCache:
+    """
+    Exact-match TTL cache for workflow execution results.
+
+    Entries expire after ``ttl`` seconds and the cache is bounded to
+    ``max_entries`` with least-recently-used eviction.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = _CACHE_MAX):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int, bytes], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _normalize(input_data: Dict[str, Any]) -> bytes:
+        # Sorted keys make the cache key order-insensitive for dict inputs
+        return orjson.dumps(input_data, option=orjson.OPT_SORT_KEYS)
+
+    def get(self, namespace: str, owner_id: int, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for this input, or None on miss/expiry."""
+        key = (namespace, owner_id, self._normalize(input_data))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, namespace: str, owner_id: int, input_data: Dict[str, Any], payload: Dict[str, Any]) -> None:
+        """Cache a successful execution result."""
+        key = (namespace, owner_id, self._normalize(input_data))
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: str, owner_id: int) -> None:
+        """Drop all entries for one agent or workflow (call after updates)."""
+        stale = [key for key in self._entries if key[0] == namespace and key[1] == owner_id]
+        for key in stale:
+            del self._entries[key]
+
+
+class TTLCache:
+    """
+    Small generic TTL cache for read-through caching of hot lookups.
+
+    Same expiry and LRU-bounding behaviour as WorkflowResultCache, but
+    keyed on a single hashable value with explicit invalidation.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = _CACHE_MAX):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None on miss/expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        """Cache a value under the given key."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Any) -> None:
+        """Drop one entry (call after the underlying row mutates)."""
+        self._entries.pop(key, None)
+
+
+# Shared process-wide cache used by the execution routes
+workflow_result_cache = WorkflowResultCache()
+
+# Read-through cache of serialized agent rows for the hot GET-by-id path;
+# invalidated by the update/deploy/delete endpoints
+agent_read_cache = TTLCache(ttl=60.0, max_entries=512)
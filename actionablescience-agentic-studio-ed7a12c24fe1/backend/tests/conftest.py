@@ -0,0 +1,15 @@
+"""Make the backend package importable and satisfy import-time config."""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# app.db builds its engine at import time from these variables; stub them
+# so collection works on a clean checkout with no .env. setdefault keeps
+# any real values from the environment.
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_PORT", "5432")
+os.environ.setdefault("DB_NAME", "test")
@@ -0,0 +1,72 @@
+"""Regression tests for the empty-input short circuit in LLMService."""
+import asyncio
+
+from app.services import llm_service as llm_service_module
+from app.services.llm_service import LLMService
+
+
+class _StubAgent:
+    """Bare attribute holder standing in for the SQLAlchemy Agent model."""
+
+    id = 1
+    tools_enabled = False
+    tools = None
+    memory_enabled = False
+    system_prompt = "You are a test agent."
+    user_prompt_template = "{input}"
+    additional_instructions = None
+    temperature = 0.2
+    max_tokens = 256
+    web_scraper_config = None
+
+
+def _make_service(monkeypatch) -> LLMService:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    llm_service_module._resolve_api_key.cache_clear()
+    LLMService.reset_executors()
+    return LLMService()
+
+
+def test_real_frontend_payload_reaches_executor(monkeypatch):
+    """The shape AgentExecutionPanel actually posts must not short-circuit.
+
+    The frontend sends {"input": ...} (optionally with "url"), never
+    "text"/"message"; a key-name-based probe silently swallowed every
+    real execution.
+    """
+    service = _make_service(monkeypatch)
+
+    async def fake_execute_agent(**kwargs):
+        return {
+            "content": "ok",
+            "tool_results": {},
+            "messages": [],
+            "error": None,
+            "processing_mode": "langgraph",
+        }
+
+    monkeypatch.setattr(service.executor, "execute_agent", fake_execute_agent)
+
+    result = asyncio.run(
+        service.execute_agent_workflow(_StubAgent(), {"input": "hello", "url": ""})
+    )
+
+    assert result.short_circuit is False
+    assert result.content == "ok"
+
+
+def test_blank_payload_short_circuits(monkeypatch):
+    """All-blank values (any key names) skip the executor entirely."""
+    service = _make_service(monkeypatch)
+
+    async def fail_execute_agent(**kwargs):
+        raise AssertionError("executor must not run for blank input")
+
+    monkeypatch.setattr(service.executor, "execute_agent", fail_execute_agent)
+
+    result = asyncio.run(
+        service.execute_agent_workflow(_StubAgent(), {"input": "   ", "url": None})
+    )
+
+    assert result.short_circuit is True
+    assert result.content == ""